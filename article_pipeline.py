@@ -0,0 +1,123 @@
+# article_pipeline.py
+from contextlib import contextmanager
+from urllib.parse import urlparse
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class HostThrottle:
+    def __init__(self, max_per_host=1, min_interval=1.0):
+        # Politeness limits: concurrent requests and minimum spacing per host
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_allowed = {}
+
+    @contextmanager
+    def slot(self, url):
+        """Hold a request slot for the URL's host, waiting out the politeness interval"""
+        host = urlparse(url).netloc.lower()
+
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+
+        with semaphore:
+            # Reserve the next start time for this host before sleeping so waiters queue up fairly
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, self._next_allowed.get(host, now))
+                self._next_allowed[host] = start_at + self.min_interval
+
+            delay = start_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            yield
+
+class ArticlePipeline:
+    def __init__(self, extract_fn, max_workers=4, max_per_host=1, host_interval=1.0, cached_fn=None):
+        self.extract_fn = extract_fn
+        # Optional cache probe tried before taking a host slot, so cached articles
+        # aren't held back by the politeness interval
+        self.cached_fn = cached_fn
+        self.max_workers = max_workers
+        self.throttle = HostThrottle(max_per_host=max_per_host, min_interval=host_interval)
+
+    def run(self, articles, process_fn, deadline=None):
+        """Extract articles in a worker pool and process each one as soon as it arrives
+
+        process_fn(index, article, content) is called on the calling thread while
+        later downloads are still running; results are returned in input order.
+        Articles still downloading at the optional time.monotonic() deadline are
+        processed with content=None.
+        """
+        if not articles:
+            return []
+
+        jobs = queue.Queue()
+        completed = queue.Queue()
+        results = [None] * len(articles)
+        waiting = set(range(len(articles)))
+
+        for index, article in enumerate(articles):
+            jobs.put((index, article))
+
+        # Daemon workers: a download abandoned at the deadline can't keep the
+        # interpreter alive at exit the way a pool's joined threads would
+        for _ in range(min(self.max_workers, len(articles))):
+            threading.Thread(target=self._worker, args=(jobs, completed), daemon=True).start()
+
+        try:
+            while waiting:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    index, content = completed.get(timeout=timeout)
+                except queue.Empty:
+                    logger.warning(f"Extraction deadline reached, {len(waiting)} articles left without content")
+                    break
+                waiting.discard(index)
+                results[index] = process_fn(index, articles[index], content)
+        finally:
+            # Don't block on stragglers past the deadline; queued downloads are dropped
+            # and ones in flight are discarded when they finish
+            self._drain(jobs)
+
+        for index in sorted(waiting):
+            results[index] = process_fn(index, articles[index], None)
+
+        return results
+
+    def _worker(self, jobs, completed):
+        """Worker thread: extract queued articles until none are left"""
+        while True:
+            try:
+                index, article = jobs.get_nowait()
+            except queue.Empty:
+                return
+            self._extract(index, article, completed)
+
+    @staticmethod
+    def _drain(jobs):
+        """Drop downloads that haven't started"""
+        while True:
+            try:
+                jobs.get_nowait()
+            except queue.Empty:
+                return
+
+    def _extract(self, index, article, completed):
+        """Worker: download one article and hand it to the processing stage"""
+        content = None
+        try:
+            if self.cached_fn:
+                content = self.cached_fn(article['url'])
+            if content is None:
+                with self.throttle.slot(article['url']):
+                    content = self.extract_fn(article['url'])
+        except Exception as e:
+            logger.error(f"Error extracting content from {article.get('url')}: {e}")
+        finally:
+            completed.put((index, content))
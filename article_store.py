@@ -0,0 +1,89 @@
+# article_store.py
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class ArticleStore:
+    """Summarised articles waiting for (or already included in) a digest"""
+
+    def __init__(self, path, retention_seconds=7 * 24 * 3600):
+        # Rows older than retention_seconds are dropped, sent or not
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                url TEXT PRIMARY KEY,
+                record TEXT NOT NULL,
+                added_at REAL NOT NULL,
+                sent_at REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_pending ON articles(sent_at, added_at)")
+        self._conn.commit()
+
+        self.prune()
+
+    def contains(self, url):
+        """True if the article has already been summarised"""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM articles WHERE url = ?", (url,)).fetchone()
+        return row is not None
+
+    def add(self, records):
+        """Store summary records from NewsProcessor.generate_detailed_summaries; known URLs are kept as-is"""
+        now = time.time()
+        rows = [(record['source_url'], json.dumps(record), now) for record in records if record.get('source_url')]
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO articles (url, record, added_at) VALUES (?, ?, ?)", rows
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Article store write failed: {e}")
+
+    def pending(self, max_age_seconds=None):
+        """Unsent records in the order they were added, optionally only recent ones"""
+        since = time.time() - max_age_seconds if max_age_seconds else 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record FROM articles WHERE sent_at IS NULL AND added_at >= ? ORDER BY added_at, rowid",
+                (since,)
+            ).fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    def mark_sent(self, urls, sent_at=None):
+        """Record that these articles went out in a digest"""
+        sent_at = sent_at or time.time()
+        with self._lock:
+            self._conn.executemany("UPDATE articles SET sent_at = ? WHERE url = ?",
+                                   [(sent_at, url) for url in urls])
+            self._conn.commit()
+
+    def prune(self):
+        """Drop rows past the retention period"""
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM articles WHERE added_at < ?",
+                                   (time.time() - self.retention_seconds,))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Article store prune failed: {e}")
+
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
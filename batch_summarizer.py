@@ -0,0 +1,157 @@
+# batch_summarizer.py
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class BatchSummarizer:
+    def __init__(self, load_summarizer, batch_size=8, sort_window=4, metrics=None, seconds_per_item=0.0):
+        # Chunks are queued, sorted by token length and run through the model in batches;
+        # load_summarizer is called on first flush so queueing never forces a model load
+        self._load_summarizer = load_summarizer
+        self._summarizer = None
+        self.batch_size = max(1, batch_size)
+        self.sort_window = max(1, sort_window)
+        self.metrics = metrics
+        self._pending = []
+        self._results = {}
+        self._seconds = {}
+        self._next_ticket = 0
+        # Observed throughput, used to avoid starting a batch that would overrun a deadline;
+        # seconds_per_item is the estimate until the first batch has run
+        self.seconds_per_item = seconds_per_item
+        self._items_run = 0
+        self._seconds_run = 0.0
+
+    @property
+    def summarizer(self):
+        """The summarisation pipeline, resolved on first use"""
+        if self._summarizer is None:
+            self._summarizer = self._load_summarizer()
+        return self._summarizer
+
+    def add(self, text, **generate_kwargs):
+        """Queue a text for summarisation and return a ticket for its result"""
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self._pending.append((ticket, text, generate_kwargs))
+        return ticket
+
+    @property
+    def pending_count(self):
+        """Number of texts queued but not yet summarised"""
+        return len(self._pending)
+
+    def flush_if_ready(self):
+        """Run queued work once enough has built up to fill several sorted batches"""
+        if len(self._pending) >= self.batch_size * self.sort_window:
+            self.flush()
+
+    def flush(self, deadline=None):
+        """Summarise everything queued so far
+
+        Batches that would finish past the optional time.monotonic() deadline, judged
+        by the throughput seen so far, are skipped and their tickets resolve to None
+        like any other failed chunk.
+        """
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+
+        # Batches can only share generation settings, so group on those first
+        groups = {}
+        for ticket, text, generate_kwargs in pending:
+            key = tuple(sorted(generate_kwargs.items()))
+            groups.setdefault(key, []).append((ticket, text))
+
+        for key, items in groups.items():
+            generate_kwargs = dict(key)
+
+            # Sorting by token length keeps similarly sized inputs together and cuts padding
+            lengths = self._token_lengths([text for _, text in items])
+            ordered = sorted(zip(lengths, items), key=lambda pair: pair[0])
+            if self.metrics:
+                self.metrics.incr('tokens_summarised', sum(lengths))
+
+            for start in range(0, len(ordered), self.batch_size):
+                size = min(self.batch_size, len(ordered) - start)
+                if deadline is not None and time.monotonic() + self._estimate(size) > deadline:
+                    skipped = ordered[start:]
+                    logger.warning(f"Time budget exhausted, skipping {len(skipped)} queued chunks")
+                    for _, (ticket, _) in skipped:
+                        self._results[ticket] = None
+                    if self.metrics:
+                        self.metrics.incr('chunks_skipped', len(skipped))
+                    break
+                self._timed_batch(ordered[start:start + self.batch_size], generate_kwargs)
+
+    def _estimate(self, items):
+        """Expected seconds for a batch of this many items, from batches run so far"""
+        if not self._items_run:
+            return items * self.seconds_per_item
+        return items * self._seconds_run / self._items_run
+
+    def result(self, ticket):
+        """Return the summary for a ticket, or None if summarisation failed"""
+        return self._results.pop(ticket, None)
+
+    def seconds(self, ticket):
+        """Model time attributed to a ticket, by its share of the batch's tokens"""
+        return self._seconds.pop(ticket, 0.0)
+
+    def _timed_batch(self, sized_items, generate_kwargs):
+        """Run one batch and record how long it took"""
+        start = time.perf_counter()
+        self._run_batch([item for _, item in sized_items], generate_kwargs)
+        elapsed = time.perf_counter() - start
+        self._items_run += len(sized_items)
+        self._seconds_run += elapsed
+
+        total_tokens = sum(length for length, _ in sized_items) or 1
+        for length, (ticket, _) in sized_items:
+            self._seconds[ticket] = elapsed * length / total_tokens
+
+        if self.metrics:
+            self.metrics.add_stage_time('inference', elapsed)
+            self.metrics.incr('model_batches')
+            self.metrics.incr('chunks_summarised', len(sized_items))
+
+    def _run_batch(self, items, generate_kwargs):
+        """Summarise one batch, retrying item by item if the batch fails"""
+        texts = [text for _, text in items]
+        try:
+            outputs = self.summarizer(texts, batch_size=len(texts), **generate_kwargs)
+            for (ticket, _), output in zip(items, outputs):
+                self._results[ticket] = self._summary_text(output)
+            return
+        except Exception as e:
+            if len(items) == 1:
+                logger.warning(f"Error summarizing chunk: {e}")
+                self._results[items[0][0]] = None
+                return
+            logger.warning(f"Error summarizing batch of {len(items)}, retrying individually: {e}")
+
+        for ticket, text in items:
+            try:
+                output = self.summarizer(text, **generate_kwargs)
+                self._results[ticket] = self._summary_text(output)
+            except Exception as e:
+                logger.warning(f"Error summarizing chunk: {e}")
+                self._results[ticket] = None
+
+    def _token_lengths(self, texts):
+        """Token counts for sorting, falling back to word counts without a tokenizer"""
+        tokenizer = getattr(self.summarizer, 'tokenizer', None)
+        if tokenizer is not None:
+            try:
+                return [len(ids) for ids in tokenizer(texts)['input_ids']]
+            except Exception as e:
+                logger.debug(f"Tokenizer length check failed, using word counts: {e}")
+        return [len(text.split()) for text in texts]
+
+    def _summary_text(self, output):
+        """Pull summary text out of a pipeline result for a single input"""
+        if isinstance(output, list):
+            output = output[0]
+        return output['summary_text']
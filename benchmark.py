@@ -0,0 +1,630 @@
+# benchmark.py
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+from dedup_index import DedupIndex, normalise_tokens
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_fixtures')
+
+def _synthetic_titles(n, seed=0):
+    """Headline-like titles with a Zipfian vocabulary and ~10% near-duplicates"""
+    rng = random.Random(seed)
+    vocab = [f"word{i}" for i in range(20000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+
+    titles = []
+    for _ in range(n):
+        if titles and rng.random() < 0.1:
+            # Reword an earlier headline slightly
+            words = rng.choice(titles).split()
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+            titles.append(' '.join(words))
+        else:
+            titles.append(' '.join(rng.choices(vocab, weights=weights, k=rng.randint(6, 14))))
+    return titles
+
+def _legacy_dedup(titles):
+    """The original pairwise Jaccard scan, kept as the baseline"""
+    seen_titles = []
+    unique = 0
+    for title in titles:
+        normalized_title = re.sub(r'[^\w\s]', '', title.lower())
+        words1 = set(normalized_title.split())
+        is_duplicate = False
+        for seen_title in seen_titles:
+            words2 = set(seen_title.split())
+            union = words1 | words2
+            if union and len(words1 & words2) / len(union) > 0.8:
+                is_duplicate = True
+                break
+        if not is_duplicate:
+            seen_titles.append(normalized_title)
+            unique += 1
+    return unique
+
+def _indexed_dedup(titles):
+    """Dedup through DedupIndex, as NewsProcessor._remove_duplicates does"""
+    token_sets = [normalise_tokens(title) for title in titles]
+    index = DedupIndex(threshold=0.8, corpus=token_sets)
+    return sum(index.add_if_new(tokens) for tokens in token_sets)
+
+def bench_dedup(args):
+    print(f"{'titles':>8} {'legacy (s)':>12} {'indexed (s)':>12} {'unique':>8}")
+    for n in args.sizes:
+        titles = _synthetic_titles(n)
+
+        start = time.perf_counter()
+        unique = _indexed_dedup(titles)
+        indexed = time.perf_counter() - start
+
+        legacy = '-'
+        if n <= args.legacy_limit:
+            start = time.perf_counter()
+            legacy_unique = _legacy_dedup(titles)
+            legacy = f"{time.perf_counter() - start:.3f}"
+            assert legacy_unique == unique, "index disagrees with pairwise scan"
+
+        print(f"{n:>8} {legacy:>12} {indexed:>12.3f} {unique:>8}")
+
+class FixtureServer:
+    """Local HTTP server replaying the recorded feed and article pages
+
+    The recorded feed items are repeated to produce as many entries as needed,
+    each with its own URL and a title distinct enough to survive de-duplication.
+    """
+
+    def __init__(self, num_items, latency=0.0):
+        self.num_items = num_items
+        self.latency = latency
+        self._items = [
+            {field: item.findtext(field, '') for field in ('title', 'link', 'pubDate', 'description')}
+            for item in ET.parse(os.path.join(FIXTURE_DIR, 'feed.xml')).getroot().iter('item')
+        ]
+        self._pages = {}
+        for item in self._items:
+            with open(os.path.join(FIXTURE_DIR, item['link']), 'rb') as f:
+                self._pages['/' + item['link']] = f.read()
+        self._server = None
+
+    def start(self):
+        """Start serving in a background thread and return the base URL"""
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/feed.xml':
+                    body = fixture._feed_xml()
+                    content_type = 'application/rss+xml'
+                elif path in fixture._pages:
+                    body = fixture._pages[path]
+                    content_type = 'text/html; charset=utf-8'
+                else:
+                    self.send_error(404)
+                    return
+
+                # Injected latency stands in for real network round trips
+                if fixture.latency:
+                    time.sleep(fixture.latency)
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _feed_xml(self):
+        """The recorded feed, replayed to num_items entries"""
+        base = f"http://127.0.0.1:{self._server.server_address[1]}"
+        entries = []
+        for i in range(self.num_items):
+            item = self._items[i % len(self._items)]
+            title = f"{item['title']} update u{i} ref r{i * 7919 % 100003}"
+            link = f"{base}/{item['link']}?item={i}"
+            entries.append(
+                f"<item><title>{escape(title)}</title><link>{escape(link)}</link>"
+                f"<guid>{escape(link)}</guid><pubDate>{item['pubDate']}</pubDate>"
+                f"<description>{escape(item['description'])}</description></item>"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>Benchmark AI Wire</title>{''.join(entries)}</channel></rss>"
+        ).encode('utf-8')
+
+class StubSummarizer:
+    """Pipeline stand-in with near-zero model cost: returns the leading words of each input"""
+
+    class _Tokenizer:
+        model_max_length = 512
+
+        def __call__(self, texts, **kwargs):
+            if isinstance(texts, str):
+                return {'input_ids': texts.split()}
+            return {'input_ids': [text.split() for text in texts]}
+
+    def __init__(self, cpu_seconds_per_1k_tokens=0.0):
+        # Optional busy-wait to mimic CPU-bound inference when testing parallelism
+        self.tokenizer = self._Tokenizer()
+        self.cpu_seconds_per_1k_tokens = cpu_seconds_per_1k_tokens
+
+    def __call__(self, texts, max_length=150, **kwargs):
+        single = isinstance(texts, str)
+        items = [texts] if single else texts
+
+        if self.cpu_seconds_per_1k_tokens:
+            tokens = sum(len(text.split()) for text in items)
+            # CPU time, not wall time, so the cost is real work that competes for cores
+            deadline = time.process_time() + tokens / 1000 * self.cpu_seconds_per_1k_tokens
+            while time.process_time() < deadline:
+                pass
+
+        return [{'summary_text': ' '.join(text.split()[:max_length // 2])} for text in items]
+
+def _percentile(values, pct):
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def _run_pipeline_once(args):
+    """Child process: run fetch -> extract -> summarise once and print JSON results"""
+    # Imported here so the parent process stays small and never loads a model
+    from instrumentation import RunMetrics, peak_rss_mb
+    from news_processor import NewsProcessor
+
+    metrics = RunMetrics()
+    models = [(args.model, args.model)] if args.model else None
+    processor = NewsProcessor(
+        feeds=[f"{args.base_url}/feed.xml"],
+        extract_workers=args.workers,
+        per_host_limit=args.workers,
+        host_interval=0,
+        summary_batch_size=args.batch_size,
+        models=models,
+        metrics=metrics,
+        max_feed_entries=args.size
+    )
+
+    if args.summariser == 'stub':
+        processor.summarizer = StubSummarizer()
+    elif args.summariser == 'simple':
+        processor.summarizer = None
+    elif processor.summarizer is None:
+        # Load the model before timing; fall back loudly if it isn't cached locally
+        print(json.dumps({'error': 'no summarisation model available offline'}))
+        return
+
+    start = time.perf_counter()
+    articles = processor.fetch_ai_news(num_articles=args.size)
+    summaries = processor.generate_detailed_summaries(articles)
+    elapsed = time.perf_counter() - start
+
+    latencies = [sum(timings.values()) for timings in metrics.articles.values()]
+    print(json.dumps({
+        'articles': len(summaries),
+        'seconds': elapsed,
+        'throughput': len(summaries) / elapsed if elapsed else 0.0,
+        'p50': _percentile(latencies, 50),
+        'p95': _percentile(latencies, 95),
+        'peak_rss_mb': peak_rss_mb(),
+        'model': processor.model_name if args.summariser == 'real' else args.summariser
+    }))
+
+def bench_pipeline(args):
+    """Replay fixtures through the full pipeline for each summariser and size"""
+    # No run may touch the network: models must already be in the local cache
+    env = dict(os.environ, HF_HUB_OFFLINE='1', TRANSFORMERS_OFFLINE='1')
+
+    print(f"{'summariser':>10} {'articles':>8} {'art/s':>8} {'p50 (s)':>8} {'p95 (s)':>8} "
+          f"{'peak RSS (MB)':>14}  model")
+    for summariser in args.summarisers:
+        for size in args.sizes:
+            server = FixtureServer(size, latency=args.latency)
+            base_url = server.start()
+            try:
+                # A fresh process per run so peak RSS belongs to that run alone
+                command = [sys.executable, os.path.abspath(__file__), '_pipeline-run',
+                           '--base-url', base_url, '--size', str(size), '--summariser', summariser,
+                           '--workers', str(args.workers), '--batch-size', str(args.batch_size)]
+                if args.model:
+                    command += ['--model', args.model]
+                completed = subprocess.run(command, env=env, capture_output=True, text=True)
+            finally:
+                server.stop()
+
+            try:
+                result = json.loads(completed.stdout.strip().splitlines()[-1])
+            except (IndexError, ValueError):
+                print(f"{summariser:>10} {size:>8}  run failed:\n{completed.stderr[-2000:]}")
+                continue
+            if 'error' in result:
+                print(f"{summariser:>10} {size:>8}  skipped: {result['error']}")
+                continue
+
+            print(f"{summariser:>10} {result['articles']:>8} {result['throughput']:>8.2f} "
+                  f"{result['p50']:>8.3f} {result['p95']:>8.3f} {result['peak_rss_mb']:>14}  {result['model']}")
+
+def _fixture_texts():
+    """Article text extracted from the recorded pages"""
+    import newspaper
+
+    texts = []
+    for name in sorted(os.listdir(os.path.join(FIXTURE_DIR, 'articles'))):
+        with open(os.path.join(FIXTURE_DIR, 'articles', name), encoding='utf-8') as f:
+            article = newspaper.Article(f"http://127.0.0.1/{name}")
+            article.download(input_html=f.read())
+            article.parse()
+            texts.append(article.text)
+    return texts
+
+def _load_bench_summarizer(model):
+    """A real pipeline from the local cache, or the CPU-burning stub for 'stub'"""
+    if model == 'stub':
+        return StubSummarizer(cpu_seconds_per_1k_tokens=0.5)
+
+    from model_registry import get_registry
+    return get_registry().load(model)
+
+def _run_workers_once(args):
+    """Child process: summarise the fixture chunks with one processes x threads split"""
+    from batch_summarizer import BatchSummarizer
+    from news_processor import NewsProcessor
+    from summary_workers import ProcessPoolSummarizer
+    from text_chunker import chunk_sentences
+
+    summarizer = _load_bench_summarizer(args.model)
+    if summarizer is None:
+        print(json.dumps({'error': f"{args.model} not available offline"}))
+        return
+
+    processor = NewsProcessor(feeds=[])
+    texts = [processor._clean_text(text) for text in _fixture_texts()]
+    chunks = [chunk for text in texts for chunk in chunk_sentences(text, summarizer.tokenizer)]
+    chunks = (chunks * (args.chunks // len(chunks) + 1))[:args.chunks]
+
+    if args.processes > 1:
+        summarizer = ProcessPoolSummarizer(summarizer, workers=args.processes, torch_threads=args.threads)
+    else:
+        try:
+            import torch
+            torch.set_num_threads(args.threads)
+        except ImportError:
+            pass
+
+    def run(batch_chunks):
+        batch = BatchSummarizer(lambda: summarizer, batch_size=args.batch_size)
+        for chunk in batch_chunks:
+            batch.add(chunk, max_length=150, min_length=50, do_sample=False, truncation=True)
+        batch.flush()
+
+    # Warm up once so lazy initialisation isn't counted
+    run(chunks[:args.processes])
+
+    start = time.perf_counter()
+    run(chunks)
+    elapsed = time.perf_counter() - start
+
+    if isinstance(summarizer, ProcessPoolSummarizer):
+        summarizer.close()
+    print(json.dumps({'chunks': len(chunks), 'seconds': elapsed}))
+
+def bench_workers(args):
+    """Compare single-process inference against forked worker pools"""
+    env = dict(os.environ, HF_HUB_OFFLINE='1', TRANSFORMERS_OFFLINE='1')
+
+    print(f"model: {args.model}, {args.chunks} chunks, batch size {args.batch_size}")
+    print(f"{'processes':>9} {'threads':>8} {'seconds':>9} {'chunks/s':>9} {'speedup':>8}")
+    baseline = None
+    for config in args.configs:
+        processes, threads = (int(part) for part in config.lower().split('x'))
+        command = [sys.executable, os.path.abspath(__file__), '_workers-run',
+                   '--model', args.model, '--chunks', str(args.chunks),
+                   '--batch-size', str(args.batch_size),
+                   '--processes', str(processes), '--threads', str(threads)]
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+
+        try:
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            print(f"{processes:>9} {threads:>8}  run failed:\n{completed.stderr[-2000:]}")
+            continue
+        if 'error' in result:
+            print(f"{processes:>9} {threads:>8}  skipped: {result['error']}")
+            continue
+
+        baseline = baseline or result['seconds']
+        print(f"{processes:>9} {threads:>8} {result['seconds']:>9.2f} "
+              f"{result['chunks'] / result['seconds']:>9.2f} {baseline / result['seconds']:>7.2f}x")
+
+def _run_generation_once(args):
+    """Child process: summarise the fixture texts with one generation preset"""
+    from batch_summarizer import BatchSummarizer
+    from generation_policy import GenerationPolicy
+    from news_processor import NewsProcessor
+    from text_chunker import chunk_sentences, token_counts
+
+    summarizer = _load_bench_summarizer(args.model)
+    if summarizer is None:
+        print(json.dumps({'error': f"{args.model} not available offline"}))
+        return
+    tokenizer = summarizer.tokenizer
+
+    # The same inputs NewsProcessor would queue: whole short articles, chunks of long ones
+    processor = NewsProcessor(feeds=[])
+    inputs = []
+    for text in _fixture_texts():
+        chunks = chunk_sentences(processor._clean_text(text), tokenizer)
+        role = 'chunk' if len(chunks) > 1 else 'article'
+        inputs.extend((chunk, role) for chunk in chunks)
+    inputs = inputs * args.repeat
+
+    def settings(text, role):
+        if args.preset == 'fixed':
+            # The old behaviour: fixed lengths and the model's own decoding settings
+            max_length, min_length = (200, 100) if role == 'article' else (150, 50)
+            return dict(max_length=max_length, min_length=min_length, do_sample=False, truncation=True)
+        return GenerationPolicy(args.preset).kwargs(text, tokenizer, role=role)
+
+    def run(items):
+        batch = BatchSummarizer(lambda: summarizer, batch_size=args.batch_size)
+        tickets = [batch.add(text, **settings(text, role)) for text, role in items]
+        batch.flush()
+        return [batch.result(ticket) or '' for ticket in tickets]
+
+    # Warm up once so lazy initialisation isn't counted
+    run(inputs[:1])
+
+    start = time.perf_counter()
+    summaries = run(inputs)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        'inputs': len(inputs),
+        'seconds': elapsed,
+        'input_tokens': sum(token_counts([text for text, _ in inputs], tokenizer)),
+        'output_tokens': sum(token_counts(summaries, tokenizer))
+    }))
+
+def bench_generation(args):
+    """Wall time and decode throughput for each generation preset"""
+    env = dict(os.environ, HF_HUB_OFFLINE='1', TRANSFORMERS_OFFLINE='1')
+
+    print(f"model: {args.model}, fixture texts x{args.repeat}, batch size {args.batch_size}")
+    print(f"{'preset':>9} {'inputs':>7} {'seconds':>9} {'out tokens':>11} {'decode tok/s':>13} {'speedup':>8}")
+    baseline = None
+    for preset in args.presets:
+        command = [sys.executable, os.path.abspath(__file__), '_generation-run',
+                   '--model', args.model, '--preset', preset,
+                   '--repeat', str(args.repeat), '--batch-size', str(args.batch_size)]
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+
+        try:
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            print(f"{preset:>9}  run failed:\n{completed.stderr[-2000:]}")
+            continue
+        if 'error' in result:
+            print(f"{preset:>9}  skipped: {result['error']}")
+            continue
+
+        baseline = baseline or result['seconds']
+        print(f"{preset:>9} {result['inputs']:>7} {result['seconds']:>9.2f} {result['output_tokens']:>11} "
+              f"{result['output_tokens'] / result['seconds']:>13.1f} {baseline / result['seconds']:>7.2f}x")
+
+def _rouge_tokens(text):
+    return re.findall(r"\w+", text.lower())
+
+def _f1(overlap, candidate_len, reference_len):
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / candidate_len, overlap / reference_len
+    return 2 * precision * recall / (precision + recall)
+
+def _rouge_1(candidate, reference):
+    """Unigram-overlap F1"""
+    from collections import Counter
+
+    cand, ref = Counter(_rouge_tokens(candidate)), Counter(_rouge_tokens(reference))
+    return _f1(sum((cand & ref).values()), sum(cand.values()), sum(ref.values()))
+
+def _rouge_l(candidate, reference):
+    """Longest-common-subsequence F1"""
+    cand, ref = _rouge_tokens(candidate), _rouge_tokens(reference)
+    previous = [0] * (len(ref) + 1)
+    for token in cand:
+        current = [0]
+        for j, ref_token in enumerate(ref):
+            current.append(previous[j] + 1 if token == ref_token else max(previous[j + 1], current[j]))
+        previous = current
+    return _f1(previous[-1], len(cand), len(ref))
+
+def _run_quality_once(args):
+    """Child process: load one backend and summarise the fixture chunks"""
+    from instrumentation import peak_rss_mb
+    from inference_backends import load_seq2seq
+    from news_processor import NewsProcessor
+    from text_chunker import chunk_sentences
+
+    try:
+        import torch
+        torch.set_num_threads(args.threads)
+    except ImportError:
+        pass
+
+    # Load the backend directly: the registry would quietly fall back to pytorch
+    start = time.perf_counter()
+    try:
+        from transformers import pipeline
+        model, tokenizer = load_seq2seq(args.model, backend=args.backend, local_files_only=True,
+                                        artefact_dir=args.artefact_dir)
+        summarizer = pipeline("summarization", model=model, tokenizer=tokenizer)
+    except Exception as e:
+        print(json.dumps({'error': f"{args.backend} not available: {e}"}))
+        return
+    load_seconds = time.perf_counter() - start
+
+    processor = NewsProcessor(feeds=[])
+    texts = [processor._clean_text(text) for text in _fixture_texts()]
+    chunks = [chunk for text in texts for chunk in chunk_sentences(text, tokenizer)]
+
+    # Warm up once so lazy initialisation isn't counted
+    summarizer(chunks[:1], max_length=150, min_length=50, do_sample=False, truncation=True)
+
+    summaries, latencies = [], []
+    for chunk in chunks:
+        start = time.perf_counter()
+        output = summarizer(chunk, max_length=150, min_length=50, do_sample=False, truncation=True)
+        latencies.append(time.perf_counter() - start)
+        summaries.append(output[0]['summary_text'])
+
+    print(json.dumps({'summaries': summaries, 'latencies': latencies,
+                      'load_seconds': load_seconds, 'peak_rss_mb': peak_rss_mb()}))
+
+def bench_quality(args):
+    """Latency, memory and ROUGE against fp32 output for each inference backend"""
+    import tempfile
+
+    env = dict(os.environ, HF_HUB_OFFLINE='1', TRANSFORMERS_OFFLINE='1')
+    artefact_dir = args.artefact_dir or tempfile.mkdtemp(prefix='news-bench-models-')
+
+    print(f"model: {args.model}, {args.threads} torch threads, converted models in {artefact_dir}")
+    print(f"{'backend':>10} {'load s':>8} {'p50 s':>8} {'p95 s':>8} {'peak RSS MB':>12} "
+          f"{'ROUGE-1':>8} {'ROUGE-L':>8}")
+    reference = None
+    for backend in args.backends:
+        command = [sys.executable, os.path.abspath(__file__), '_quality-run',
+                   '--model', args.model, '--backend', backend,
+                   '--threads', str(args.threads), '--artefact-dir', artefact_dir]
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+
+        try:
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            print(f"{backend:>10}  run failed:\n{completed.stderr[-2000:]}")
+            continue
+        if 'error' in result:
+            print(f"{backend:>10}  skipped: {result['error']}")
+            continue
+
+        # Scores are relative to the first backend listed (fp32 pytorch by default)
+        reference = reference or result['summaries']
+        pairs = list(zip(result['summaries'], reference))
+        rouge_1 = sum(_rouge_1(cand, ref) for cand, ref in pairs) / len(pairs)
+        rouge_l = sum(_rouge_l(cand, ref) for cand, ref in pairs) / len(pairs)
+
+        print(f"{backend:>10} {result['load_seconds']:>8.2f} {_percentile(result['latencies'], 50):>8.3f} "
+              f"{_percentile(result['latencies'], 95):>8.3f} {result['peak_rss_mb']:>12} "
+              f"{rouge_1:>8.3f} {rouge_l:>8.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the news pipeline")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    dedup = subparsers.add_parser('dedup', help="title de-duplication scaling")
+    dedup.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000, 100000])
+    dedup.add_argument('--legacy-limit', type=int, default=10000,
+                       help="largest size to run the quadratic baseline on")
+    dedup.set_defaults(func=bench_dedup)
+
+    pipeline = subparsers.add_parser('pipeline', help="fetch -> extract -> summarise on recorded fixtures")
+    pipeline.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    pipeline.add_argument('--summarisers', nargs='+', default=['stub', 'simple', 'real'],
+                          choices=['real', 'stub', 'simple'])
+    pipeline.add_argument('--model', help="model for the real summariser (default: NewsProcessor's chain)")
+    pipeline.add_argument('--workers', type=int, default=4, help="extraction workers")
+    pipeline.add_argument('--batch-size', type=int, default=8, help="summarisation batch size")
+    pipeline.add_argument('--latency', type=float, default=0.0, help="injected seconds per HTTP response")
+    pipeline.set_defaults(func=bench_pipeline)
+
+    cores = os.cpu_count() or 1
+    workers = subparsers.add_parser('workers', help="single-process vs forked summarisation workers")
+    workers.add_argument('--model', default='t5-small', help="cached model name, or 'stub'")
+    workers.add_argument('--chunks', type=int, default=64)
+    workers.add_argument('--batch-size', type=int, default=8)
+    workers.add_argument('--configs', nargs='+',
+                         default=[f"1x{cores}", f"2x{max(1, cores // 2)}", f"{cores}x1"],
+                         help="processes x torch threads per process, e.g. 2x4")
+    workers.set_defaults(func=bench_workers)
+
+    quality = subparsers.add_parser('quality', help="pytorch vs quantized vs ONNX latency and ROUGE")
+    quality.add_argument('--model', default='t5-small', help="model in the local cache")
+    quality.add_argument('--backends', nargs='+', default=['pytorch', 'quantized', 'onnx'],
+                         choices=['pytorch', 'quantized', 'onnx'],
+                         help="first backend is the ROUGE reference")
+    quality.add_argument('--threads', type=int, default=cores)
+    quality.add_argument('--artefact-dir', help="where converted models are written (default: temp dir)")
+    quality.set_defaults(func=bench_quality)
+
+    generation = subparsers.add_parser('generation', help="decode speed of the generation presets")
+    generation.add_argument('--model', default='t5-small', help="cached model name")
+    generation.add_argument('--presets', nargs='+', default=['fixed', 'quality', 'balanced', 'fast'],
+                            choices=['fixed', 'quality', 'balanced', 'fast'],
+                            help="'fixed' is the old fixed-length setting; speedups are relative to the first")
+    generation.add_argument('--repeat', type=int, default=4, help="times to repeat the fixture texts")
+    generation.add_argument('--batch-size', type=int, default=8)
+    generation.set_defaults(func=bench_generation)
+
+    # Internal: one isolated pipeline run, spawned by the pipeline benchmark
+    run_once = subparsers.add_parser('_pipeline-run')
+    run_once.add_argument('--base-url', required=True)
+    run_once.add_argument('--size', type=int, required=True)
+    run_once.add_argument('--summariser', required=True)
+    run_once.add_argument('--model')
+    run_once.add_argument('--workers', type=int, default=4)
+    run_once.add_argument('--batch-size', type=int, default=8)
+    run_once.set_defaults(func=_run_pipeline_once)
+
+    # Internal: one isolated worker configuration, spawned by the workers benchmark
+    workers_once = subparsers.add_parser('_workers-run')
+    workers_once.add_argument('--model', required=True)
+    workers_once.add_argument('--chunks', type=int, required=True)
+    workers_once.add_argument('--batch-size', type=int, default=8)
+    workers_once.add_argument('--processes', type=int, default=1)
+    workers_once.add_argument('--threads', type=int, default=1)
+    workers_once.set_defaults(func=_run_workers_once)
+
+    # Internal: one isolated backend, spawned by the quality benchmark
+    quality_once = subparsers.add_parser('_quality-run')
+    quality_once.add_argument('--model', required=True)
+    quality_once.add_argument('--backend', required=True)
+    quality_once.add_argument('--threads', type=int, default=1)
+    quality_once.add_argument('--artefact-dir')
+    quality_once.set_defaults(func=_run_quality_once)
+
+    # Internal: one isolated generation preset, spawned by the generation benchmark
+    generation_once = subparsers.add_parser('_generation-run')
+    generation_once.add_argument('--model', required=True)
+    generation_once.add_argument('--preset', required=True)
+    generation_once.add_argument('--repeat', type=int, default=1)
+    generation_once.add_argument('--batch-size', type=int, default=8)
+    generation_once.set_defaults(func=_run_generation_once)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# daemon.py
+from datetime import datetime, timedelta
+import logging
+import threading
+
+from dedup_index import DedupIndex, normalise_tokens
+from digest import Digest, DigestRenderer
+from emails_utils import send_email
+
+logger = logging.getLogger(__name__)
+
+class DigestDaemon:
+    """Long-running mode: poll feeds on an interval, send the digest at a fixed time
+
+    New articles are summarised as they appear and kept in an ArticleStore, so
+    sending the digest only renders and emails records that are already done.
+    At send time the stored records are ranked like a one-shot run would rank
+    feed entries (relevance, recency, source). The model stays loaded between polls.
+    """
+
+    def __init__(self, processor, store, send_at="07:30", poll_interval=900,
+                 articles_per_poll=10, digest_size=5, max_age=24 * 3600, report_dir=None):
+        self.processor = processor
+        self.store = store
+        # Local time of day (HH:MM) the digest goes out
+        self.send_at = datetime.strptime(send_at, "%H:%M").time()
+        self.poll_interval = poll_interval
+        self.articles_per_poll = articles_per_poll
+        self.digest_size = digest_size
+        # Unsent articles older than this are left out of the digest
+        self.max_age = max_age
+        self.report_dir = report_dir
+        self._stop = threading.Event()
+
+    def run(self):
+        """Poll and send until stop() is called"""
+        self._warm_up()
+
+        next_poll = datetime.now()
+        next_send = self._next_send_time(datetime.now())
+        logger.info(f"Daemon started: polling every {self.poll_interval}s, next digest at {next_send:%Y-%m-%d %H:%M}")
+
+        while not self._stop.is_set():
+            now = datetime.now()
+            if now >= next_poll:
+                self.poll()
+                next_poll = datetime.now() + timedelta(seconds=self.poll_interval)
+            if now >= next_send:
+                self.send_digest()
+                next_send = self._next_send_time(datetime.now())
+                logger.info(f"Next digest at {next_send:%Y-%m-%d %H:%M}")
+
+            wait = (min(next_poll, next_send) - datetime.now()).total_seconds()
+            self._stop.wait(max(0.0, wait))
+
+        logger.info("Daemon stopped")
+
+    def stop(self):
+        """Ask the loop to exit after its current step"""
+        self._stop.set()
+
+    def poll(self):
+        """Fetch new entries, summarise the ones not seen before and store them"""
+        try:
+            articles = self.processor.fetch_ai_news(num_articles=self.articles_per_poll)
+            new_articles = [article for article in articles if not self.store.contains(article['url'])]
+            if new_articles:
+                logger.info(f"Summarising {len(new_articles)} new articles")
+                records = self.processor.generate_detailed_summaries(new_articles)
+                # Publication time is kept for ranking at send time; stored as text so records stay JSON
+                for article, record in zip(new_articles, records):
+                    published_at = article.get('published_at')
+                    record['published_at'] = published_at.isoformat() if published_at else None
+                self.store.add(records)
+
+            # Only entries that are safely stored needn't be returned again; the
+            # rest stay unseen and compete in the next poll
+            self.processor.save_feed_state([article for article in articles if self.store.contains(article['url'])])
+        except Exception as e:
+            logger.error(f"Poll failed: {e}")
+
+    def send_digest(self):
+        """Email the stored, unsent articles"""
+        try:
+            stories = self._select_stories(self.store.pending(self.max_age))
+            if not stories:
+                logger.warning("No new articles to send")
+                return
+
+            metrics = self.processor.metrics
+            with metrics.stage('render'):
+                digest = Digest(stories)
+                body, html_body = DigestRenderer().render(digest)
+            with metrics.stage('send'):
+                send_email(digest.subject, body, html_body)
+            self.store.mark_sent(story['source_url'] for story in stories)
+            self.processor.archive_digest(digest)
+            logger.info(f"Digest sent with {len(stories)} articles")
+
+            self.store.prune()
+            if self.report_dir:
+                metrics.write_report(self.report_dir)
+            # One report per digest; otherwise per-article timings pile up forever
+            metrics.reset()
+        except Exception as e:
+            logger.error(f"Sending the digest failed: {e}")
+
+    def _rank(self, records):
+        """Records best first, scored on their summaries with the processor's ranker"""
+        ranker = self.processor.ranker
+        if ranker is None or not records:
+            # Ranking disabled: oldest first, as collected
+            return records
+
+        candidates = []
+        for record in records:
+            published_at = record.get('published_at')
+            candidates.append({
+                'record': record,
+                'title': record['title'],
+                'summary': f"{record.get('detailed_summary') or ''} {record.get('key_points') or ''}",
+                'published_at': datetime.fromisoformat(published_at) if published_at else None,
+                'source': record.get('source'),
+            })
+        with self.processor.metrics.stage('rank'):
+            return [candidate['record'] for candidate in ranker.rank(candidates)]
+
+    def _warm_up(self):
+        """Load the summarisation model before the first poll"""
+        with self.processor.metrics.stage('warm_up'):
+            if self.processor.summarizer is None:
+                logger.warning("No summarisation model available; using simple summaries")
+
+    def _select_stories(self, records):
+        """Best-ranked records, without near-duplicate headlines collected across polls, up to digest_size"""
+        index = DedupIndex()
+        stories = []
+        for record in self._rank(records):
+            if index.add_if_new(normalise_tokens(record['title'])):
+                stories.append(record)
+                if len(stories) >= self.digest_size:
+                    break
+        return stories
+
+    def _next_send_time(self, now):
+        """Next occurrence of send_at strictly after now"""
+        candidate = datetime.combine(now.date(), self.send_at)
+        if candidate <= now:
+            candidate += timedelta(days=1)
+        return candidate
@@ -0,0 +1,89 @@
+# dedup_index.py
+from collections import Counter
+import re
+import zlib
+
+def normalise_tokens(text):
+    """Lowercase, strip punctuation and return the set of words"""
+    return frozenset(re.sub(r'[^\w\s]', '', text.lower()).split())
+
+class DedupIndex:
+    """Near-duplicate lookup on token sets using Jaccard similarity
+
+    Uses prefix filtering: two sets with Jaccard similarity above the threshold
+    must share a token within the first few tokens of each set under a fixed
+    global order. Only those prefix tokens are indexed, so a lookup touches a
+    handful of short posting lists instead of every stored set, and candidates
+    are verified with the exact Jaccard score.
+
+    Ordering tokens rarest-first keeps the posting lists short. Pass the token
+    sets that will be indexed (when known up front) to build that order;
+    otherwise a hash order is used.
+    """
+
+    def __init__(self, threshold=0.8, corpus=None):
+        self.threshold = threshold
+        self._sets = []
+        self._postings = {}
+        self._frequencies = Counter(token for tokens in corpus for token in tokens) if corpus else None
+
+    def __len__(self):
+        return len(self._sets)
+
+    def find_duplicate(self, tokens):
+        """Index of a stored set with similarity above the threshold, or None"""
+        if not tokens:
+            return None
+
+        size = len(tokens)
+        checked = set()
+        for position, token in enumerate(self._prefix(tokens)):
+            for doc_id, other_position in self._postings.get(token, ()):
+                if doc_id in checked:
+                    continue
+                checked.add(doc_id)
+
+                other = self._sets[doc_id]
+                # Sets whose sizes differ too much can't reach the threshold
+                if not (self.threshold * len(other) < size < len(other) / self.threshold):
+                    continue
+
+                # Positional filter: tokens before the first shared one can't overlap, so
+                # bound the best possible overlap before paying for a set intersection
+                required = int(self.threshold / (1 + self.threshold) * (size + len(other))) + 1
+                if 1 + min(size - position - 1, len(other) - other_position - 1) < required:
+                    continue
+
+                intersection = len(tokens & other)
+                union = size + len(other) - intersection
+                if intersection / union > self.threshold:
+                    return doc_id
+        return None
+
+    def add(self, tokens):
+        """Store a token set and return its index"""
+        doc_id = len(self._sets)
+        self._sets.append(tokens)
+        for position, token in enumerate(self._prefix(tokens)):
+            self._postings.setdefault(token, []).append((doc_id, position))
+        return doc_id
+
+    def add_if_new(self, tokens):
+        """Store the set unless it near-duplicates one already stored; True if stored"""
+        if self.find_duplicate(tokens) is not None:
+            return False
+        self.add(tokens)
+        return True
+
+    def _rank(self, token):
+        """Position of a token in the global order"""
+        if self._frequencies is not None:
+            return self._frequencies[token], token
+        return zlib.crc32(token.encode('utf-8')), token
+
+    def _prefix(self, tokens):
+        """Tokens that any set above the threshold must share with this one"""
+        # Similarity > t needs more than t * |tokens| shared tokens
+        min_overlap = int(self.threshold * len(tokens)) + 1
+        prefix_length = max(len(tokens) - min_overlap + 1, 1)
+        return sorted(tokens, key=self._rank)[:prefix_length]
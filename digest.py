@@ -0,0 +1,84 @@
+# digest.py
+from datetime import datetime
+from html import escape
+import io
+
+from emails_utils import HTML_FOOTER, HTML_HEADER
+
+SEPARATOR = '=' * 60
+
+class Digest:
+    def __init__(self, stories, heading="🤖 AI News Digest",
+                 intro="Today's top AI developments with detailed analysis:", date=None):
+        # stories are the records returned by NewsProcessor.generate_detailed_summaries
+        self.stories = stories
+        self.heading = heading
+        self.intro = intro
+        self.date = date or datetime.now()
+
+    @property
+    def title(self):
+        """Heading with the digest date"""
+        return f"{self.heading} - {self.date.strftime('%B %d, %Y')}"
+
+    @property
+    def subject(self):
+        """Email subject line"""
+        return self.title
+
+class DigestRenderer:
+    """Renders a Digest to plain text and HTML in a single pass over its stories"""
+
+    def render(self, digest):
+        """Return (plain_text, html) for a digest"""
+        text_out = io.StringIO()
+        html_out = io.StringIO()
+        self.render_to(digest, text_out, html_out)
+        return text_out.getvalue(), html_out.getvalue()
+
+    def render_to(self, digest, text_out, html_out):
+        """Stream both renderings of a digest to writable text streams"""
+        text_out.write(f"\n{digest.title}\n\n{digest.intro}\n\n{SEPARATOR}\n\n")
+        html_out.write(HTML_HEADER)
+        html_out.write(f'<div class="header"><h1>{escape(digest.title)}</h1></div>\n')
+        html_out.write('<hr class="separator">\n')
+
+        for i, story in enumerate(digest.stories, 1):
+            self._write_story(i, story, text_out, html_out)
+
+        generated = f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
+        text_out.write(f"\n{generated}\nPowered by your AI News Bot 🤖\n")
+        html_out.write(f'<div class="footer">{escape(generated)}<br>Powered by your AI News Bot 🤖</div>\n')
+        html_out.write(HTML_FOOTER)
+
+    def _write_story(self, number, story, text_out, html_out):
+        """Write one story to both outputs"""
+        title = story['title']
+        url = story['source_url']
+        published = story['published']
+        summary = story['detailed_summary'] or ''
+        key_points = story['key_points'] or ''
+
+        text_out.write(
+            f"\n📰 STORY {number}: {title}\n\n"
+            f"🔗 Source: {url}\n"
+            f"📅 Published: {published}\n\n"
+            f"📝 SUMMARY:\n{summary}\n\n"
+            f"🔍 KEY POINTS:\n{key_points}\n\n"
+            f"{SEPARATOR}\n\n"
+        )
+
+        safe_url = escape(url, quote=True)
+        html_out.write('<div class="article">\n')
+        html_out.write(f'<div class="title">📰 STORY {number}: {escape(title)}</div>\n')
+        html_out.write(f'<div class="meta">🔗 Source: <a href="{safe_url}" class="source-link">{safe_url}</a></div>\n')
+        html_out.write(f'<div class="meta">📅 Published: {escape(published)}</div>\n')
+        html_out.write('<div class="summary">\n')
+        for paragraph in summary.split('\n'):
+            if paragraph.strip():
+                html_out.write(f'<p>{escape(paragraph.strip())}</p>\n')
+        html_out.write('</div>\n<div class="key-points">\n<strong>🔍 KEY POINTS:</strong><br>\n')
+        for point in key_points.split('\n'):
+            if point.strip():
+                html_out.write(f'{escape(point.strip())}<br>\n')
+        html_out.write('</div>\n</div>\n<hr class="separator">\n')
@@ -0,0 +1,192 @@
+# digest_archive.py
+from datetime import datetime
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from dedup_index import normalise_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_PATH = os.path.join(os.getenv("NEWS_CACHE_DIR", ".news_cache"), 'digest_archive.sqlite')
+
+def title_fingerprint(title):
+    """Order- and punctuation-insensitive hash of a headline"""
+    words = ' '.join(sorted(normalise_tokens(title or '')))
+    return hashlib.sha1(words.encode('utf-8')).hexdigest()[:16]
+
+class DigestArchive:
+    """Append-only record of every story sent, with full-text search
+
+    Stories live in an ordinary table indexed by URL and title fingerprint;
+    titles, summaries and key points are also indexed in an FTS5 table when
+    the SQLite build has it (otherwise search falls back to LIKE).
+    """
+
+    def __init__(self, path=DEFAULT_ARCHIVE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS digests (
+                id INTEGER PRIMARY KEY,
+                subject TEXT NOT NULL,
+                sent_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS stories (
+                id INTEGER PRIMARY KEY,
+                digest_id INTEGER NOT NULL REFERENCES digests(id),
+                url TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                title TEXT NOT NULL,
+                summary TEXT,
+                key_points TEXT,
+                record TEXT NOT NULL,
+                sent_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_stories_sent ON stories(sent_at);
+            CREATE INDEX IF NOT EXISTS idx_stories_url ON stories(url);
+            CREATE INDEX IF NOT EXISTS idx_stories_fingerprint ON stories(fingerprint);
+        """)
+        self.has_fts = self._create_fts()
+        self._conn.commit()
+
+    def _create_fts(self):
+        """Full-text index over stories, kept in sync by the insert path"""
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS stories_fts USING fts5("
+                "title, summary, key_points, content='stories', content_rowid='id')"
+            )
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable, archive search will be slower: {e}")
+            return False
+
+    def add_digest(self, subject, records, sent_at=None):
+        """Archive a sent digest's summary records; returns the digest id"""
+        sent_at = sent_at or time.time()
+        with self._lock:
+            cursor = self._conn.execute("INSERT INTO digests (subject, sent_at) VALUES (?, ?)", (subject, sent_at))
+            digest_id = cursor.lastrowid
+            for record in records:
+                cursor = self._conn.execute(
+                    "INSERT INTO stories (digest_id, url, fingerprint, title, summary, key_points, record, sent_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (digest_id, record['source_url'], title_fingerprint(record['title']), record['title'],
+                     record.get('detailed_summary'), record.get('key_points'), json.dumps(record), sent_at)
+                )
+                if self.has_fts:
+                    self._conn.execute(
+                        "INSERT INTO stories_fts (rowid, title, summary, key_points) VALUES (?, ?, ?, ?)",
+                        (cursor.lastrowid, record['title'], record.get('detailed_summary'), record.get('key_points'))
+                    )
+            self._conn.commit()
+        return digest_id
+
+    def recent(self, days):
+        """URLs and title fingerprints of stories sent in the last `days` days"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, fingerprint FROM stories WHERE sent_at >= ?", (time.time() - days * 86400,)
+            ).fetchall()
+        return {url for url, _ in rows}, {fingerprint for _, fingerprint in rows}
+
+    def filter_new(self, articles, days=30):
+        """Drop candidates whose URL or headline went out in the last `days` days
+
+        One indexed query loads the recent keys; each article is then two set lookups.
+        """
+        urls, fingerprints = self.recent(days)
+        fresh = [article for article in articles
+                 if article['url'] not in urls and title_fingerprint(article['title']) not in fingerprints]
+        if len(fresh) < len(articles):
+            logger.info(f"Skipping {len(articles) - len(fresh)} articles already sent in the last {days} days")
+        return fresh
+
+    def search(self, query, days=None, limit=20):
+        """Stories matching the query words, newest first"""
+        since = time.time() - days * 86400 if days else 0
+        words = re.findall(r'\w+', query)
+        if not words:
+            return []
+
+        with self._lock:
+            if self.has_fts:
+                # Quote each word so user input can't be read as FTS syntax
+                match = ' '.join(f'"{word}"' for word in words)
+                rows = self._conn.execute(
+                    "SELECT s.sent_at, s.title, s.url, snippet(stories_fts, 1, '[', ']', '...', 12) "
+                    "FROM stories_fts JOIN stories s ON s.id = stories_fts.rowid "
+                    "WHERE stories_fts MATCH ? AND s.sent_at >= ? ORDER BY s.sent_at DESC LIMIT ?",
+                    (match, since, limit)
+                ).fetchall()
+            else:
+                conditions = ' AND '.join("(title || ' ' || COALESCE(summary, '')) LIKE ?" for _ in words)
+                rows = self._conn.execute(
+                    f"SELECT sent_at, title, url, substr(COALESCE(summary, ''), 1, 120) FROM stories "
+                    f"WHERE {conditions} AND sent_at >= ? ORDER BY sent_at DESC LIMIT ?",
+                    [f"%{word}%" for word in words] + [since, limit]
+                ).fetchall()
+
+        return [{'sent_at': datetime.fromtimestamp(sent_at), 'title': title, 'url': url, 'snippet': snippet}
+                for sent_at, title, url, snippet in rows]
+
+    def digests(self, days=None):
+        """(sent_at, subject, story count) for recent digests, newest first"""
+        since = time.time() - days * 86400 if days else 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.sent_at, d.subject, COUNT(s.id) FROM digests d LEFT JOIN stories s ON s.digest_id = d.id "
+                "WHERE d.sent_at >= ? GROUP BY d.id ORDER BY d.sent_at DESC", (since,)
+            ).fetchall()
+        return [(datetime.fromtimestamp(sent_at), subject, count) for sent_at, subject, count in rows]
+
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the archive of sent digests")
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE_PATH, help="archive database path")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    search = subparsers.add_parser('search', help="stories mentioning all the given words")
+    search.add_argument('query', nargs='+')
+    search.add_argument('--days', type=int, help="only the last N days")
+    search.add_argument('--limit', type=int, default=20)
+
+    listing = subparsers.add_parser('digests', help="digests sent recently")
+    listing.add_argument('--days', type=int, default=30)
+
+    args = parser.parse_args()
+    if not os.path.exists(args.archive):
+        parser.exit(1, f"No archive at {args.archive}\n")
+
+    archive = DigestArchive(args.archive)
+    try:
+        if args.command == 'search':
+            for story in archive.search(' '.join(args.query), days=args.days, limit=args.limit):
+                print(f"{story['sent_at']:%Y-%m-%d}  {story['title']}\n            {story['url']}\n"
+                      f"            {story['snippet']}")
+        else:
+            for sent_at, subject, count in archive.digests(days=args.days):
+                print(f"{sent_at:%Y-%m-%d %H:%M}  {count:>2} stories  {subject}")
+    finally:
+        archive.close()
+
+if __name__ == "__main__":
+    main()
@@ -7,119 +7,186 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-def send_email(subject, body):
-    """Send HTML email with better formatting"""
-    try:
-        sender = os.getenv("EMAIL_USER")
-        recipient = os.getenv("EMAIL_TO")
-        password = os.getenv("EMAIL_PASS")
-        
-        if not all([sender, recipient, password]):
-            raise ValueError("Email credentials not properly configured")
-        
-        # Create multipart message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = sender
-        msg['To'] = recipient
-        
-        # Convert plain text to HTML for better formatting
-        html_body = convert_to_html(body)
-        
-        # Attach both plain text and HTML versions
-        text_part = MIMEText(body, 'plain')
-        html_part = MIMEText(html_body, 'html')
-        
-        msg.attach(text_part)
-        msg.attach(html_part)
-        
-        # Send email
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-            server.login(sender, password)
-            server.send_message(msg)
-            
-        logger.info(f"Email sent successfully to {recipient}")
-        
-    except Exception as e:
-        logger.error(f"Failed to send email: {e}")
-        raise
-
-def convert_to_html(text):
-    """Convert plain text to HTML with better formatting"""
-    # Basic HTML structure
-    html = f"""
+# Shared page wrapper for HTML emails
+HTML_HEADER = """
     <!DOCTYPE html>
     <html>
     <head>
         <meta charset="UTF-8">
         <style>
-            body {{
+            body {
                 font-family: Arial, sans-serif;
                 line-height: 1.6;
                 color: #333;
                 max-width: 800px;
                 margin: 0 auto;
                 padding: 20px;
-            }}
-            .header {{
+            }
+            .header {
                 background-color: #f8f9fa;
                 padding: 20px;
                 border-radius: 8px;
                 margin-bottom: 20px;
-            }}
-            .article {{
+            }
+            .article {
                 background-color: #ffffff;
                 border: 1px solid #e9ecef;
                 border-radius: 8px;
                 padding: 20px;
                 margin-bottom: 20px;
-            }}
-            .title {{
+            }
+            .title {
                 color: #2c3e50;
                 font-size: 1.2em;
                 font-weight: bold;
                 margin-bottom: 10px;
-            }}
-            .meta {{
+            }
+            .meta {
                 color: #6c757d;
                 font-size: 0.9em;
                 margin-bottom: 15px;
-            }}
-            .summary {{
+            }
+            .summary {
                 margin-bottom: 15px;
                 text-align: justify;
-            }}
-            .key-points {{
+            }
+            .key-points {
                 background-color: #f8f9fa;
                 padding: 15px;
                 border-left: 4px solid #007bff;
                 margin-bottom: 15px;
-            }}
-            .source-link {{
+            }
+            .source-link {
                 color: #007bff;
                 text-decoration: none;
-            }}
-            .source-link:hover {{
+            }
+            .source-link:hover {
                 text-decoration: underline;
-            }}
-            .separator {{
+            }
+            .separator {
                 border: 0;
                 height: 1px;
                 background-color: #dee2e6;
                 margin: 30px 0;
-            }}
-            .footer {{
+            }
+            .footer {
                 text-align: center;
                 color: #6c757d;
                 font-size: 0.9em;
                 margin-top: 30px;
                 padding-top: 20px;
                 border-top: 1px solid #dee2e6;
-            }}
+            }
         </style>
     </head>
     <body>
     """
+
+HTML_FOOTER = """
+    </body>
+    </html>
+    """
+
+def send_email(subject, body, html_body=None):
+    """Send HTML email with better formatting"""
+    try:
+        sender = os.getenv("EMAIL_USER")
+        recipient = os.getenv("EMAIL_TO")
+        password = os.getenv("EMAIL_PASS")
+        
+        if not all([sender, recipient, password]):
+            raise ValueError("Email credentials not properly configured")
+        
+        msg = build_message(sender, recipient, subject, body, html_body)
+        
+        # Send email
+        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
+            server.login(sender, password)
+            server.send_message(msg)
+            
+        logger.info(f"Email sent successfully to {recipient}")
+        
+    except Exception as e:
+        logger.error(f"Failed to send email: {e}")
+        raise
+
+# A dropped or dead connection; the message is retried on a new one
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+class PartialSendError(Exception):
+    """Sending stopped part way through; sent holds the messages that did go out"""
+    
+    def __init__(self, message, sent):
+        super().__init__(message)
+        self.sent = sent
+
+def send_emails(messages, max_reconnects=2):
+    """Send several (recipient, subject, body, html_body) emails over one SMTP login
+
+    A message the server rejects is logged and skipped; returns the messages that
+    were sent. A dropped connection is re-opened up to max_reconnects times. If
+    sending can't carry on, PartialSendError is raised with the messages already sent.
+    """
+    sender = os.getenv("EMAIL_USER")
+    password = os.getenv("EMAIL_PASS")
+    
+    if not all([sender, password]):
+        raise ValueError("Email credentials not properly configured")
+    
+    sent = []
+    remaining = list(messages)
+    reconnects = 0
+    while remaining:
+        try:
+            with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
+                server.login(sender, password)
+                while remaining:
+                    recipient, subject, body, html_body = message = remaining[0]
+                    try:
+                        server.send_message(build_message(sender, recipient, subject, body, html_body))
+                        sent.append(message)
+                        logger.info(f"Email '{subject}' sent to {recipient}")
+                    except CONNECTION_ERRORS:
+                        raise
+                    except smtplib.SMTPException as e:
+                        logger.error(f"Failed to send '{subject}' to {recipient}: {e}")
+                    remaining.pop(0)
+        except CONNECTION_ERRORS as e:
+            if reconnects >= max_reconnects:
+                logger.error(f"SMTP connection lost, giving up with {len(remaining)} emails unsent: {e}")
+                raise PartialSendError(str(e), sent) from e
+            reconnects += 1
+            logger.warning(f"SMTP connection lost, reconnecting ({reconnects}/{max_reconnects}): {e}")
+        except Exception as e:
+            logger.error(f"Failed to send emails: {e}")
+            raise PartialSendError(str(e), sent) from e
+    
+    return sent
+
+def build_message(sender, recipient, subject, body, html_body=None):
+    """Multipart plain text + HTML message"""
+    # Create multipart message
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = sender
+    msg['To'] = recipient
+    
+    # Convert plain text to HTML unless a rendered version was supplied
+    if html_body is None:
+        html_body = convert_to_html(body)
+    
+    # Attach both plain text and HTML versions
+    text_part = MIMEText(body, 'plain')
+    html_part = MIMEText(html_body, 'html')
+    
+    msg.attach(text_part)
+    msg.attach(html_part)
+    return msg
+
+def convert_to_html(text):
+    """Convert plain text to HTML with better formatting"""
+    # Basic HTML structure
+    html = HTML_HEADER
     
     # Process the text content
     lines = text.split('\n')
@@ -161,9 +228,6 @@ def convert_to_html(text):
     if in_article:
         html += '</div>\n</div>\n'
     
-    html += """
-    </body>
-    </html>
-    """
+    html += HTML_FOOTER
     
     return html
\ No newline at end of file
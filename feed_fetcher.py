@@ -0,0 +1,97 @@
+# feed_fetcher.py
+from concurrent.futures import ThreadPoolExecutor, wait
+import logging
+import time
+
+from feed_parser import parse_feed
+from http_client import HttpClient
+
+logger = logging.getLogger(__name__)
+
+class FeedFetcher:
+    def __init__(self, feed_timeout=10, deadline=30, max_workers=8, state=None, metrics=None, http=None,
+                 max_entries=50):
+        # Per-feed network timeout (seconds) and overall deadline for the whole fetch stage
+        self.feed_timeout = feed_timeout
+        self.deadline = deadline
+        self.max_workers = max_workers
+        # Parsing stops after this many entries per feed
+        self.max_entries = max_entries
+        # Pooled HTTP client, normally shared with article downloads
+        self.http = http or HttpClient(timeout=feed_timeout)
+        # Optional FeedStateStore: enables conditional GETs and new-entry filtering
+        self.state = state
+        self.metrics = metrics
+
+    def fetch_all(self, feed_urls):
+        """Fetch and parse feeds concurrently, returning (url, feed) pairs in input order
+
+        feed is None for feeds that failed or timed out. A feed that wasn't modified
+        comes back with the candidates held over from its last download.
+        """
+        if not feed_urls:
+            return []
+
+        start = time.monotonic()
+        results = [(url, None) for url in feed_urls]
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(feed_urls)))
+        try:
+            futures = {executor.submit(self._fetch_one, url): i for i, url in enumerate(feed_urls)}
+            done, not_done = wait(futures, timeout=self.deadline)
+
+            for future in done:
+                index = futures[future]
+                try:
+                    results[index] = (feed_urls[index], future.result())
+                except Exception as e:
+                    logger.error(f"Error fetching from {feed_urls[index]}: {e}")
+                    self._incr('feed_errors')
+
+            for future in not_done:
+                future.cancel()
+                logger.warning(f"Skipping {feed_urls[futures[future]]}: fetch deadline of {self.deadline}s exceeded")
+                self._incr('feeds_timed_out')
+        finally:
+            # Don't block on stragglers; their results are discarded
+            executor.shutdown(wait=False)
+
+        logger.info(f"Fetched {len(feed_urls)} feeds in {time.monotonic() - start:.2f}s")
+        return results
+
+    def _fetch_one(self, feed_url):
+        """Download a single feed with a timeout and parse it"""
+        logger.info(f"Fetching from: {feed_url}")
+        headers = self.state.request_headers(feed_url) if self.state else None
+
+        response = self.http.get(feed_url, headers=headers, timeout=self.feed_timeout)
+
+        # Nothing changed since the last run, so there's nothing to parse; entries
+        # that weren't picked last time are still candidates
+        if response.status_code == 304:
+            self._incr('feeds_not_modified')
+            feed = self.state.pending_feed(feed_url)
+            logger.info(f"Not modified since last run: {feed_url} ({len(feed.entries)} entries held over)")
+            return feed
+
+        response.raise_for_status()
+        self._incr('bytes_downloaded.feeds', len(response.content))
+        self._incr('bytes_transferred.feeds', response.wire_bytes)
+        feed = parse_feed(response.content, max_entries=self.max_entries)
+
+        if self.state:
+            self.state.update_validators(
+                feed_url,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+            total = len(feed.entries)
+            feed.entries = self.state.new_entries(feed_url, feed)
+            logger.info(f"{len(feed.entries)} of {total} entries are new in {feed_url}")
+
+        return feed
+
+    def _incr(self, name, amount=1):
+        """Bump a run counter when metrics are being collected"""
+        if self.metrics:
+            self.metrics.incr(name, amount)
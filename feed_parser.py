@@ -0,0 +1,167 @@
+# feed_parser.py
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+import io
+import logging
+
+import feedparser
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+RSS1 = '{http://purl.org/rss/1.0/}'
+DC = '{http://purl.org/dc/elements/1.1/}'
+
+# Element tags that hold one entry, for RSS 2.0, Atom and RSS 1.0 (RDF)
+ENTRY_TAGS = ('item', f'{ATOM}entry', f'{RSS1}item')
+FEED_TAGS = ('channel', f'{ATOM}feed', f'{RSS1}channel')
+
+# Child element -> entry field; the first match for a field wins
+FIELD_TAGS = {
+    'title': 'title', f'{ATOM}title': 'title', f'{RSS1}title': 'title',
+    'link': 'link', f'{ATOM}link': 'link', f'{RSS1}link': 'link',
+    'guid': 'id', f'{ATOM}id': 'id',
+    'pubDate': 'published', f'{ATOM}published': 'published', f'{ATOM}updated': 'published',
+    f'{DC}date': 'published',
+    'description': 'summary', f'{ATOM}summary': 'summary', f'{ATOM}content': 'summary',
+    f'{RSS1}description': 'summary',
+}
+
+# Formats the original digest understood, tried after RFC 822 and ISO 8601
+LEGACY_DATE_FORMATS = ('%a, %d %b %Y %H:%M:%S %Z', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d')
+
+class FeedEntry:
+    """The fields of a feed entry the pipeline uses"""
+
+    __slots__ = ('id', 'title', 'link', 'published', 'summary')
+
+    def __init__(self, title, link, id=None, published=None, summary=''):
+        self.title = title
+        self.link = link
+        self.id = id
+        # Raw date string as it appeared in the feed
+        self.published = published
+        self.summary = summary
+
+    @property
+    def published_at(self):
+        """Publication time as a datetime, or None if it can't be parsed"""
+        return parse_date(self.published)
+
+class ParsedFeed:
+    def __init__(self, title, entries):
+        self.title = title
+        self.entries = entries
+
+@lru_cache(maxsize=4096)
+def parse_date(value):
+    """Parse a feed date string (RFC 822, ISO 8601 or a legacy format); memoised"""
+    if not value or value == 'Unknown':
+        return None
+    value = value.strip()
+
+    try:
+        parsed = parsedate_to_datetime(value)
+        if parsed is not None:
+            return parsed
+    except (TypeError, ValueError, IndexError):
+        pass
+
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+
+    for fmt in LEGACY_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+def parse_feed(content, max_entries=None):
+    """Parse RSS/Atom bytes into a ParsedFeed, reading at most max_entries entries
+
+    Entries are streamed with lxml iterparse and each element is freed once read.
+    Feeds lxml can't parse strictly go through feedparser instead.
+    """
+    try:
+        return _iterparse(content, max_entries)
+    except (etree.XMLSyntaxError, ValueError) as e:
+        logger.info(f"Streaming parse failed ({e}), falling back to feedparser")
+        return _feedparser_fallback(content, max_entries)
+
+def _iterparse(content, max_entries):
+    """Streaming parse; raises ValueError for documents that aren't feeds"""
+    title = None
+    entries = []
+    entry = None
+    root_checked = False
+
+    context = etree.iterparse(io.BytesIO(content), events=('start', 'end'),
+                              resolve_entities=False, no_network=True, huge_tree=False)
+    for event, element in context:
+        tag = element.tag
+        if not isinstance(tag, str):
+            # Comments and processing instructions
+            continue
+
+        if event == 'start':
+            if not root_checked:
+                root_checked = True
+                if etree.QName(tag).localname not in ('rss', 'feed', 'RDF'):
+                    raise ValueError(f"not a feed document (root <{etree.QName(tag).localname}>)")
+            if tag in ENTRY_TAGS:
+                entry = {}
+            continue
+
+        if tag in ENTRY_TAGS:
+            if entry.get('title') and entry.get('link'):
+                entries.append(FeedEntry(**entry))
+            entry = None
+            _free(element)
+            if max_entries is not None and len(entries) >= max_entries:
+                break
+        elif entry is not None:
+            field = FIELD_TAGS.get(tag)
+            if field and field not in entry:
+                value = _element_value(element, field)
+                if value:
+                    entry[field] = value
+        elif title is None and tag in (f'{ATOM}title', f'{RSS1}title', 'title'):
+            parent = element.getparent()
+            if parent is not None and parent.tag in FEED_TAGS:
+                title = (element.text or '').strip()
+
+    return ParsedFeed(title, entries)
+
+def _element_value(element, field):
+    """Text of an entry field; Atom links live in the href of the alternate link"""
+    if field == 'link' and element.tag == f'{ATOM}link':
+        return element.get('href') if element.get('rel', 'alternate') == 'alternate' else None
+    return (element.text or '').strip()
+
+def _free(element):
+    """Drop a finished entry and any earlier siblings so memory stays flat"""
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+def _feedparser_fallback(content, max_entries):
+    """Lenient parse of malformed feeds"""
+    parsed = feedparser.parse(content)
+    entries = []
+    for item in parsed.entries[:max_entries]:
+        if item.get('title') and item.get('link'):
+            entries.append(FeedEntry(
+                title=item.title,
+                link=item.link,
+                id=item.get('id'),
+                published=item.get('published') or item.get('updated'),
+                summary=item.get('summary', '')
+            ))
+    return ParsedFeed(parsed.feed.get('title'), entries)
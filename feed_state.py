@@ -0,0 +1,136 @@
+# feed_state.py
+import json
+import logging
+import os
+import threading
+import time
+
+from feed_parser import FeedEntry, ParsedFeed
+
+logger = logging.getLogger(__name__)
+
+class FeedStateStore:
+    def __init__(self, path=None, max_seen=1000, max_pending_age=2 * 24 * 3600, max_summary_chars=2000):
+        # Per-feed HTTP validators, the IDs of entries already delivered and the
+        # candidates still waiting to be delivered; kept in memory if path is None
+        self.path = path
+        self.max_seen = max_seen
+        # Undelivered candidates are offered again (even after a 304) until they're
+        # this old, counted from when they first appeared
+        self.max_pending_age = max_pending_age
+        self.max_summary_chars = max_summary_chars
+        self._lock = threading.Lock()
+        self._feeds = {}
+
+        if path:
+            try:
+                with open(path) as f:
+                    self._feeds = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable feed state {path}: {e}")
+
+    def request_headers(self, feed_url):
+        """Conditional GET headers for a feed"""
+        state = self._feeds.get(feed_url, {})
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+        return headers
+
+    def new_entries(self, feed_url, feed):
+        """Filter a freshly downloaded feed down to entries not delivered on an earlier run
+
+        Entries only count as seen once mark_seen() is called for them; until then
+        they're kept as pending candidates, so a later 304 can still offer them.
+        """
+        now = time.time()
+        with self._lock:
+            state = self._feeds.setdefault(feed_url, {})
+            seen = set(state.get('seen', []))
+            first_seen = {entry['id']: entry['first_seen'] for entry in state.get('pending', [])}
+
+            fresh, pending = [], []
+            for entry in feed.entries:
+                entry_id = self.entry_id(entry)
+                if entry_id in seen:
+                    continue
+                fresh.append(entry)
+                pending.append(self._pending_record(entry, entry_id, first_seen.get(entry_id, now)))
+
+            # Entries that dropped out of the feed are no longer candidates
+            state['title'] = feed.title
+            state['pending'] = self._unexpired(pending, now)
+
+        return fresh
+
+    def pending_feed(self, feed_url):
+        """Undelivered candidates from the last full download, for a feed that answered 304"""
+        with self._lock:
+            state = self._feeds.get(feed_url, {})
+            state['pending'] = self._unexpired(state.get('pending', []), time.time())
+            entries = [FeedEntry(title=record['title'], link=record['link'], id=record['entry_id'],
+                                 published=record['published'], summary=record['summary'])
+                       for record in state['pending']]
+            return ParsedFeed(state.get('title'), entries)
+
+    def mark_seen(self, feed_url, entry_ids):
+        """Record entries as delivered (or not worth delivering) so later runs skip them"""
+        entry_ids = list(dict.fromkeys(entry_ids))
+        with self._lock:
+            state = self._feeds.setdefault(feed_url, {})
+            seen = state.get('seen', [])
+            seen_set = set(seen)
+            seen.extend(entry_id for entry_id in entry_ids if entry_id not in seen_set)
+            # Keep the most recent IDs only so the store doesn't grow forever
+            state['seen'] = seen[-self.max_seen:]
+
+            done = set(entry_ids)
+            state['pending'] = [record for record in state.get('pending', []) if record['id'] not in done]
+
+    def update_validators(self, feed_url, etag=None, last_modified=None):
+        """Remember the ETag / Last-Modified returned with a feed"""
+        with self._lock:
+            state = self._feeds.setdefault(feed_url, {})
+            state['etag'] = etag
+            state['last_modified'] = last_modified
+
+    def save(self):
+        """Write state to disk; call once the run's articles have been delivered"""
+        if not self.path:
+            return
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(self._feeds, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not save feed state: {e}")
+
+    def _pending_record(self, entry, entry_id, first_seen):
+        """JSON-safe copy of a candidate entry"""
+        return {
+            'id': entry_id,
+            'entry_id': entry.id,
+            'title': entry.title,
+            'link': entry.link,
+            'published': entry.published,
+            'summary': (entry.summary or '')[:self.max_summary_chars],
+            'first_seen': first_seen,
+        }
+
+    def _unexpired(self, records, now):
+        """Candidates that appeared within max_pending_age"""
+        return [record for record in records if now - record['first_seen'] < self.max_pending_age]
+
+    @staticmethod
+    def entry_id(entry):
+        """Stable identifier for a feed entry"""
+        return entry.id or entry.link or entry.title or ''
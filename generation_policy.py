@@ -0,0 +1,68 @@
+# generation_policy.py
+import logging
+
+from text_chunker import token_counts
+
+logger = logging.getLogger(__name__)
+
+# Decoding presets, slowest and best first. 'quality' keeps the model's own
+# generation config (beam search for every model we ship with)
+PRESETS = {
+    'quality': {},
+    'balanced': {'num_beams': 2, 'early_stopping': True},
+    'fast': {'num_beams': 1},
+}
+
+# Output length limits for a whole short article and for one chunk of a long
+# one: (max_length, min_length) at full input size
+LENGTH_LIMITS = {
+    'article': (200, 100),
+    'chunk': (150, 50),
+}
+
+# Inputs are bucketed by token count so texts of similar size share generation
+# settings and can still be batched together
+TOKEN_BUCKETS = (128, 256, 512)
+
+# Bump when LENGTH_LIMITS, TOKEN_BUCKETS or the length rules change, so cached
+# summaries made under the old rules aren't served
+POLICY_VERSION = 1
+
+class GenerationPolicy:
+    """Generation kwargs scaled to the input's length, with a decoding speed preset
+
+    Output length is a fraction of the input (max_ratio / min_ratio of its
+    token bucket), capped at the fixed limits used for full-size inputs, so a
+    short article no longer decodes (or pads out to) a long summary.
+    """
+
+    def __init__(self, preset='quality', max_ratio=0.5, min_ratio=0.2, floor=30):
+        if preset not in PRESETS:
+            raise ValueError(f"Unknown generation preset {preset!r}; expected one of {tuple(PRESETS)}")
+        self.preset = preset
+        self.max_ratio = max_ratio
+        self.min_ratio = min_ratio
+        self.floor = floor
+
+    @property
+    def cache_tag(self):
+        """Identifies the settings behind a summary, for summary cache keys"""
+        return f"{self.preset}/v{POLICY_VERSION}/{self.max_ratio}-{self.min_ratio}-{self.floor}"
+
+    def kwargs(self, text, tokenizer=None, role='chunk'):
+        """Pipeline kwargs for summarising text as an 'article' or a 'chunk'"""
+        return self.kwargs_for_tokens(token_counts([text], tokenizer)[0], role)
+
+    def kwargs_for_tokens(self, input_tokens, role='chunk'):
+        """Pipeline kwargs for an input of this many tokens"""
+        max_limit, min_limit = LENGTH_LIMITS[role]
+        bucket = next((size for size in TOKEN_BUCKETS if input_tokens <= size), None)
+
+        if bucket is None:
+            max_length, min_length = max_limit, min_limit
+        else:
+            max_length = min(max_limit, max(self.floor, int(bucket * self.max_ratio)))
+            min_length = min(min_limit, int(bucket * self.min_ratio), max_length // 2)
+
+        return dict(PRESETS[self.preset], max_length=max_length, min_length=min_length,
+                    do_sample=False, truncation=True)
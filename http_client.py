@@ -0,0 +1,141 @@
+# http_client.py
+from contextlib import contextmanager
+from urllib.parse import urlparse
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (compatible; DailyNewsSummariser/1.0)'
+
+# Transient failures worth retrying; anything else is returned to the caller
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def _accept_encoding():
+    """Compression schemes urllib3 can decode here (brotli only when it's installed)"""
+    try:
+        import brotli  # noqa: F401
+        return 'gzip, deflate, br'
+    except ImportError:
+        return 'gzip, deflate'
+
+class ResponseTooLarge(requests.RequestException):
+    """The response body exceeded the client's size limit"""
+
+class HttpResponse:
+    """A fully read, size-checked response"""
+
+    def __init__(self, response, content, wire_bytes):
+        self.url = response.url
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.content = content
+        # Bytes that actually crossed the network, before decompression
+        self.wire_bytes = wire_bytes
+        self._response = response
+
+    @property
+    def text(self):
+        """Body decoded with the declared charset, or UTF-8"""
+        # requests assumes ISO-8859-1 for any text/* without a charset, which
+        # mangles most pages; only trust an explicit charset
+        encoding = get_encoding_from_headers(self.headers)
+        if not encoding or 'charset' not in self.headers.get('Content-Type', '').lower():
+            encoding = 'utf-8'
+        try:
+            return self.content.decode(encoding, errors='replace')
+        except LookupError:
+            return self.content.decode('utf-8', errors='replace')
+
+    def raise_for_status(self):
+        self._response.raise_for_status()
+
+class HttpClient:
+    """One pooled keep-alive session for every feed and article request
+
+    Connections to the same host are reused across requests and threads, bodies
+    are requested compressed, transient failures are retried with exponential
+    backoff, and each host gets at most max_per_host requests in flight.
+    """
+
+    def __init__(self, timeout=10, max_bytes=5 * 1024 * 1024, retries=2, backoff=0.5,
+                 pool_size=16, max_per_host=4, user_agent=USER_AGENT, total_timeout=None):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_per_host = max_per_host
+        # Wall-clock limit for one get(), retries and body included; timeout alone
+        # only bounds each socket operation
+        self.total_timeout = total_timeout or 3 * timeout
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            # A server's Retry-After can be minutes long and urllib3 sleeps it out
+            # uncapped, past any fetch deadline; short backoff is used instead
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'User-Agent': user_agent, 'Accept-Encoding': _accept_encoding()})
+
+        self._lock = threading.Lock()
+        self._host_slots = {}
+
+    def get(self, url, headers=None, timeout=None, max_bytes=None, total_timeout=None):
+        """GET a URL and read the whole body, refusing bodies over max_bytes or taking over total_timeout"""
+        max_bytes = max_bytes or self.max_bytes
+        total_timeout = min(total_timeout or self.total_timeout, self.total_timeout)
+
+        with self._host_slot(url):
+            deadline = time.monotonic() + total_timeout
+            response = self.session.get(url, headers=headers, timeout=timeout or self.timeout, stream=True)
+            try:
+                # Refuse early when the server announces an oversized body
+                declared = response.headers.get('Content-Length', '')
+                if declared.isdigit() and int(declared) > max_bytes:
+                    raise ResponseTooLarge(f"{url} is {declared} bytes (limit {max_bytes})")
+
+                # The limit applies to decompressed bytes, which also guards against compression bombs
+                chunks, size = [], 0
+                for chunk in response.iter_content(chunk_size=16 * 1024):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ResponseTooLarge(f"{url} exceeded {max_bytes} bytes")
+                    # A slow trickle never trips the per-read timeout
+                    if time.monotonic() > deadline:
+                        raise requests.Timeout(f"{url} took longer than {total_timeout:.0f}s")
+                    chunks.append(chunk)
+
+                wire_bytes = response.raw.tell() if hasattr(response.raw, 'tell') else size
+                return HttpResponse(response, b''.join(chunks), wire_bytes)
+            finally:
+                # Hands the connection back to the pool (or drops it if the body wasn't read)
+                response.close()
+
+    @contextmanager
+    def _host_slot(self, url):
+        """Cap concurrent requests per host across all callers sharing the client"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._host_slots.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        with semaphore:
+            yield
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
@@ -0,0 +1,96 @@
+# inference_backends.py
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# pytorch: plain fp32 weights
+# quantized: torch dynamic int8 quantization of the Linear layers
+# onnx: ONNX Runtime export via optimum (optional dependency: pip install -r requirements-onnx.txt;
+#       optimum 1.4.x is the last release that works with the pinned transformers 4.21)
+BACKENDS = ('pytorch', 'quantized', 'onnx')
+
+def load_seq2seq(model_name, backend='pytorch', local_files_only=True, artefact_dir=None):
+    """Load (model, tokenizer) for a summarisation model on the requested backend
+
+    Converted models are written under artefact_dir after the first conversion
+    and loaded from there on later runs.
+    """
+    # Imported here so importing this module doesn't pull in torch
+    from transformers import AutoTokenizer
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend {backend!r}; expected one of {BACKENDS}")
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name, local_files_only=local_files_only)
+
+    if backend == 'quantized':
+        model = _load_quantized(model_name, local_files_only, artefact_dir)
+    elif backend == 'onnx':
+        model = _load_onnx(model_name, local_files_only, artefact_dir)
+    else:
+        from transformers import AutoModelForSeq2SeqLM
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name, local_files_only=local_files_only)
+
+    return model, tokenizer
+
+def _artefact_path(artefact_dir, model_name, backend):
+    """Where a converted model is kept"""
+    return os.path.join(artefact_dir, backend, model_name.replace('/', '--'))
+
+def _quantize(model):
+    """Dynamic int8 quantization of every Linear layer"""
+    import torch
+
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def _load_quantized(model_name, local_files_only, artefact_dir):
+    """int8 model, reusing the saved quantized weights when available"""
+    import torch
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM
+
+    weights_path = os.path.join(_artefact_path(artefact_dir, model_name, 'quantized'), 'model.pt') \
+        if artefact_dir else None
+
+    if weights_path and os.path.exists(weights_path):
+        # Build the quantized architecture and load int8 weights directly; the fp32
+        # checkpoint never has to be read again
+        config = AutoConfig.from_pretrained(model_name, local_files_only=local_files_only)
+        model = _quantize(AutoModelForSeq2SeqLM.from_config(config).eval())
+        model.load_state_dict(torch.load(weights_path))
+        logger.info(f"Loaded quantized {model_name} from {weights_path}")
+        return model
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name, local_files_only=local_files_only)
+    model = _quantize(model.eval())
+
+    if weights_path:
+        os.makedirs(os.path.dirname(weights_path), exist_ok=True)
+        torch.save(model.state_dict(), weights_path)
+        logger.info(f"Saved quantized {model_name} to {weights_path}")
+    return model
+
+def _load_onnx(model_name, local_files_only, artefact_dir):
+    """ONNX Runtime model, exported once and reused from disk"""
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise RuntimeError("the onnx backend needs optimum[onnxruntime] installed") from e
+
+    export_dir = _artefact_path(artefact_dir, model_name, 'onnx') if artefact_dir else None
+    if export_dir and os.path.isdir(export_dir):
+        logger.info(f"Loaded ONNX export of {model_name} from {export_dir}")
+        return ORTModelForSeq2SeqLM.from_pretrained(export_dir)
+
+    if local_files_only:
+        # optimum 1.4 exports from the hub cache without a local-only switch, so
+        # check the checkpoint is cached before starting the export
+        from transformers import AutoConfig
+        AutoConfig.from_pretrained(model_name, local_files_only=True)
+
+    # from_transformers is optimum 1.4's name for exporting from a transformers checkpoint
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name, from_transformers=True)
+    if export_dir:
+        model.save_pretrained(export_dir)
+        logger.info(f"Saved ONNX export of {model_name} to {export_dir}")
+    return model
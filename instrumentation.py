@@ -0,0 +1,142 @@
+# instrumentation.py
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+class RunMetrics:
+    """Stage timers, per-article timers and counters for one pipeline run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start a new reporting period, e.g. after each digest in a long-running process"""
+        with self._lock:
+            self.started_at = datetime.now()
+            self._start = time.perf_counter()
+            self.stages = defaultdict(float)
+            self.articles = defaultdict(lambda: defaultdict(float))
+            self.counters = Counter()
+            self.profile = None
+
+    @contextmanager
+    def stage(self, name):
+        """Time a pipeline stage (wall clock, accumulated if entered more than once)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.perf_counter() - start)
+
+    @contextmanager
+    def article_stage(self, article_key, name):
+        """Time one step of processing a single article"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_article_time(article_key, name, time.perf_counter() - start)
+
+    def add_stage_time(self, name, seconds):
+        with self._lock:
+            self.stages[name] += seconds
+
+    def add_article_time(self, article_key, name, seconds):
+        with self._lock:
+            self.articles[article_key][name] += seconds
+
+    def incr(self, name, amount=1):
+        """Bump a counter such as bytes downloaded, cache hits or fallbacks taken"""
+        with self._lock:
+            self.counters[name] += amount
+
+    @contextmanager
+    def profiling(self, mode=None, output_dir='.'):
+        """Optionally run the block under cProfile or tracemalloc
+
+        mode is 'cprofile', 'tracemalloc' or None; findings go into the run report.
+        """
+        if mode not in ('cprofile', 'tracemalloc'):
+            if mode:
+                logger.warning(f"Unknown profiling mode {mode!r}, profiling disabled")
+            yield
+            return
+
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                os.makedirs(output_dir, exist_ok=True)
+                path = os.path.join(output_dir, f"profile_{self.started_at.strftime('%Y%m%d_%H%M%S')}.prof")
+                profiler.dump_stats(path)
+
+                summary = io.StringIO()
+                pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(25)
+                self.profile = {'mode': mode, 'stats_file': path, 'top_cumulative': summary.getvalue()}
+        else:
+            tracemalloc.start()
+            try:
+                yield
+            finally:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                top = snapshot.statistics('lineno')[:20]
+                self.profile = {
+                    'mode': mode,
+                    'peak_traced_mb': round(peak / 1024 / 1024, 2),
+                    'top_allocations': [str(stat) for stat in top]
+                }
+
+    def report(self):
+        """Machine-readable summary of the run"""
+        with self._lock:
+            articles = {key: {name: round(seconds, 4) for name, seconds in timings.items()}
+                        for key, timings in self.articles.items()}
+            report = {
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'total_seconds': round(time.perf_counter() - self._start, 4),
+                'peak_rss_mb': peak_rss_mb(),
+                'stages': {name: round(seconds, 4) for name, seconds in self.stages.items()},
+                'counters': dict(self.counters),
+                'articles': articles
+            }
+        if self.profile:
+            report['profile'] = self.profile
+        return report
+
+    def write_report(self, output_dir):
+        """Write the run report as JSON and return its path"""
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"run_report_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2, default=str)
+        logger.info(f"Run report written to {path}")
+        return path
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
@@ -0,0 +1,178 @@
+# key_points.py
+import logging
+import re
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Keyword -> weight; a phrase also counts the keywords inside it ("generative ai" scores "ai" too)
+DEFAULT_KEYWORDS = {
+    'artificial intelligence': 1.0, 'ai': 1.0, 'machine learning': 1.0, 'deep learning': 1.0,
+    'neural network': 1.0, 'automation': 1.0, 'algorithm': 1.0, 'chatbot': 1.0, 'llm': 1.0,
+    'generative ai': 1.0, 'openai': 1.0, 'anthropic': 1.0, 'google': 1.0, 'microsoft': 1.0
+}
+
+# A sentence runs up to terminal punctuation followed by whitespace (so "3.5" and
+# "example.com" don't end it), or to the end of the text
+_SENTENCE = re.compile(r'\S.*?(?:[.!?](?=\s|$)|$)', re.S)
+_WORD = re.compile(r'\w+')
+
+RANKINGS = (None, 'tfidf', 'textrank')
+
+class KeywordMatcher:
+    """Every keyword compiled into one case-insensitive, word-bounded regex"""
+
+    def __init__(self, keywords=DEFAULT_KEYWORDS):
+        # Accept a plain list too, weighting every keyword equally
+        if not isinstance(keywords, dict):
+            keywords = {keyword: 1.0 for keyword in keywords}
+        self.weights = {keyword.lower(): weight for keyword, weight in keywords.items()}
+
+        # Longest first so "generative ai" wins over "ai" at the same position;
+        # whitespace inside phrases matches any run of whitespace
+        alternatives = sorted(self.weights, key=len, reverse=True)
+        # The regex can't return overlapping matches, so keywords nested in a
+        # phrase are reported alongside it
+        self._nested = {
+            keyword: [other for other in alternatives
+                      if other != keyword and re.search(rf"\b{re.escape(other)}\b", keyword)]
+            for keyword in alternatives
+        }
+        pattern = '|'.join(r'\s+'.join(map(re.escape, keyword.split())) for keyword in alternatives)
+        self._keys = {}
+        self._regex = re.compile(rf"\b(?:{pattern})\b", re.IGNORECASE) if alternatives else None
+
+    def finditer(self, text):
+        """Yield (start, keyword) for every match in text, including keywords nested in a matched phrase"""
+        if self._regex is None:
+            return
+        for match in self._regex.finditer(text):
+            found = match.group(0).lower()
+            keyword = self._keys.get(found)
+            if keyword is None:
+                keyword = self._keys[found] = ' '.join(found.split())
+            yield match.start(), keyword
+            for nested in self._nested.get(keyword, ()):
+                yield match.start(), nested
+
+class KeyPointExtractor:
+    """Picks the sentences that best describe an article
+
+    Keywords are scored for every sentence in a single regex pass over the text;
+    each distinct keyword counts once per sentence. With ranking='tfidf' or
+    'textrank' a sentence's centrality in the article is added to its keyword score.
+    """
+
+    def __init__(self, keywords=DEFAULT_KEYWORDS, ranking=None, max_sentences=200,
+                 max_points=4, min_length=20):
+        if ranking not in RANKINGS:
+            raise ValueError(f"Unknown key point ranking {ranking!r}; expected one of {RANKINGS}")
+        self.matcher = KeywordMatcher(keywords)
+        self.ranking = ranking
+        self.max_sentences = max_sentences
+        self.max_points = max_points
+        self.min_length = min_length
+
+    def extract(self, text):
+        """Top sentences, best first; only sentences mentioning a keyword qualify"""
+        spans = self._sentence_spans(text)
+        if not spans:
+            return []
+
+        scores = self.keyword_scores(text, spans)
+        if self.ranking and np.any(scores > 0):
+            sentences = [text[start:end] for start, end in spans]
+            centrality = self._centrality(sentences)
+            scores = np.where(scores > 0, scores + centrality, 0.0)
+
+        # Stable sort keeps article order among equal scores
+        order = np.argsort(-scores, kind='stable')
+        return [self._display(text[spans[i][0]:spans[i][1]]) for i in order[:self.max_points] if scores[i] > 0]
+
+    def keyword_scores(self, text, spans):
+        """Summed weight of the distinct keywords in each sentence"""
+        scores = np.zeros(len(spans))
+        starts = np.fromiter((start for start, _ in spans), dtype=np.int64, count=len(spans))
+        ends = np.fromiter((end for _, end in spans), dtype=np.int64, count=len(spans))
+
+        matches = list(self.matcher.finditer(text[:spans[-1][1]]))
+        if not matches:
+            return scores
+
+        positions = np.fromiter((start for start, _ in matches), dtype=np.int64, count=len(matches))
+        sentence_ids = np.searchsorted(starts, positions, side='right') - 1
+        # Matches between sentences (e.g. inside a too-short fragment) don't count
+        inside = (sentence_ids >= 0) & (positions < ends[np.clip(sentence_ids, 0, None)])
+
+        seen = set()
+        for sentence_id, is_inside, (_, keyword) in zip(sentence_ids.tolist(), inside.tolist(), matches):
+            if is_inside and (sentence_id, keyword) not in seen:
+                seen.add((sentence_id, keyword))
+                scores[sentence_id] += self.matcher.weights[keyword]
+        return scores
+
+    def _sentence_spans(self, text):
+        """(start, end) offsets of the first max_sentences sentences long enough to use"""
+        spans = []
+        for match in _SENTENCE.finditer(text):
+            if len(match.group(0).strip()) > self.min_length:
+                spans.append((match.start(), match.end()))
+                if len(spans) >= self.max_sentences:
+                    break
+        return spans
+
+    def _centrality(self, sentences):
+        """Per-sentence centrality scaled to [0, 1]"""
+        vectors = _tfidf_matrix(sentences)
+        if self.ranking == 'tfidf':
+            # Cosine similarity to the article's centroid
+            centroid = vectors.mean(axis=0)
+            norm = np.linalg.norm(centroid)
+            centrality = vectors @ (centroid / norm) if norm else np.zeros(len(sentences))
+        else:
+            centrality = _textrank(vectors @ vectors.T)
+
+        peak = centrality.max()
+        return centrality / peak if peak > 0 else centrality
+
+    @staticmethod
+    def _display(sentence):
+        """Sentence as shown in the digest, without its full stop"""
+        return ' '.join(sentence.split()).rstrip('.')
+
+def _tfidf_matrix(sentences):
+    """L2-normalised TF-IDF rows, one per sentence"""
+    vocabulary = {}
+    rows, cols = [], []
+    for row, sentence in enumerate(sentences):
+        for word in _WORD.findall(sentence.lower()):
+            rows.append(row)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    counts = np.zeros((len(sentences), max(1, len(vocabulary))))
+    np.add.at(counts, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)), 1.0)
+
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1.0
+    weighted = counts * idf
+    norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+    return weighted / np.where(norms > 0, norms, 1.0)
+
+def _textrank(similarity, damping=0.85, iterations=50, tolerance=1e-6):
+    """PageRank over the sentence similarity graph"""
+    n = similarity.shape[0]
+    similarity = similarity.copy()
+    np.fill_diagonal(similarity, 0.0)
+
+    # Sentences sharing no words with any other link to every sentence equally
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.where(out_weight > 0, similarity / np.where(out_weight > 0, out_weight, 1.0), 1.0 / n)
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ rank)
+        if np.abs(updated - rank).sum() < tolerance:
+            return updated
+        rank = updated
+    return rank
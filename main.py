@@ -1,18 +1,106 @@
 # main.py
+import time
+
+# The run budget counts from here, so the imports below are charged to it too
+PROCESS_START = time.monotonic()
+
 from news_processor import NewsProcessor
-from emails_utils import send_email
-from datetime import datetime
+from emails_utils import PartialSendError, send_email, send_emails
+from digest import Digest, DigestRenderer
+from instrumentation import RunMetrics
+from article_store import ArticleStore
+from daemon import DigestDaemon
+from subscriptions import Subscriptions
+from run_budget import RunBudget
+import argparse
 import logging
+import os
+import signal
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 def main():
+    parser = argparse.ArgumentParser(description="Daily AI news digest")
+    parser.add_argument('--daemon', action='store_true',
+                        help="keep running: summarise articles as they appear and send at NEWS_SEND_AT")
+    args = parser.parse_args()
+    
+    metrics = RunMetrics()
+    report_dir = os.getenv("NEWS_REPORT_DIR", "reports")
+    
+    if args.daemon:
+        run_daemon(metrics, report_dir)
+        return
+    
     try:
-        # Initialise news processor
-        processor = NewsProcessor()
+        # NEWS_PROFILE=cprofile|tracemalloc adds profiler output to the run report
+        with metrics.profiling(os.getenv("NEWS_PROFILE"), output_dir=report_dir):
+            # NEWS_SUBSCRIPTIONS points at a topics/recipients config for several digests
+            subscriptions_path = os.getenv("NEWS_SUBSCRIPTIONS")
+            if subscriptions_path:
+                run_subscriptions(metrics, Subscriptions.load(subscriptions_path))
+            else:
+                run_digest(metrics)
         
+    except Exception as e:
+        logger.error(f"Error in main execution: {e}")
+        raise
+    
+    finally:
+        # Always leave a report behind, even for failed or empty runs
+        metrics.write_report(report_dir)
+
+def create_processor(metrics, feeds=None, budgeted=True):
+    """News processor configured from the environment"""
+    # NEWS_TIME_BUDGET (seconds) keeps the run inside the CI job timeout by
+    # degrading summaries instead of running over
+    time_budget = os.getenv("NEWS_TIME_BUDGET")
+    budget = (RunBudget(float(time_budget), metrics=metrics, started_at=PROCESS_START)
+              if time_budget and budgeted else None)
+    
+    # The cache directory persists between runs so only entries that are new
+    # since the last digest get picked up
+    return NewsProcessor(
+        feeds=feeds,
+        cache_dir=os.getenv("NEWS_CACHE_DIR", ".news_cache"),
+        only_new_entries=True,
+        metrics=metrics,
+        summary_workers=int(os.getenv("NEWS_SUMMARY_WORKERS", "1")),
+        inference_backend=os.getenv("NEWS_INFERENCE_BACKEND", "pytorch"),
+        generation_preset=os.getenv("NEWS_GENERATION_PRESET", "quality"),
+        budget=budget
+    )
+
+def run_daemon(metrics, report_dir):
+    """Poll feeds every NEWS_POLL_INTERVAL seconds and email the digest daily at NEWS_SEND_AT"""
+    # A run budget makes no sense for a process that never ends
+    processor = create_processor(metrics, budgeted=False)
+    store = ArticleStore(os.path.join(os.getenv("NEWS_CACHE_DIR", ".news_cache"), 'articles.sqlite'))
+    daemon = DigestDaemon(
+        processor,
+        store,
+        send_at=os.getenv("NEWS_SEND_AT", "07:30"),
+        poll_interval=int(os.getenv("NEWS_POLL_INTERVAL", "900")),
+        report_dir=report_dir
+    )
+    
+    # Finish the current step and exit cleanly on Ctrl-C or a service stop
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: daemon.stop())
+    
+    try:
+        daemon.run()
+    finally:
+        processor.close()
+        store.close()
+
+def run_digest(metrics):
+    """Fetch, summarise and email today's digest"""
+    processor = create_processor(metrics)
+    
+    try:
         # Fetch and process news articles
         logger.info("Fetching AI news articles...")
         articles = processor.fetch_ai_news()
@@ -26,49 +114,83 @@ def main():
         # Generate detailed summaries
         detailed_summaries = processor.generate_detailed_summaries(articles)
         
-        # Create email content
-        today = datetime.now().strftime('%B %d, %Y')
-        subject = f"🤖 AI News Digest - {today}"
+        # Create email content from the structured digest
+        with metrics.stage('render'):
+            digest = Digest(detailed_summaries)
+            body, html_body = DigestRenderer().render(digest)
         
-        # Format email body
-        body = f"""
-🤖 AI News Digest - {today}
-
-Today's top AI developments with detailed analysis:
-
-{'='*60}
-
-"""
+        # Send email
+        with metrics.stage('send'):
+            send_email(digest.subject, body, html_body)
+        logger.info("Email sent successfully!")
+        processor.archive_digest(digest)
         
-        for i, summary in enumerate(detailed_summaries, 1):
-            body += f"""
-📰 STORY {i}: {summary['title']}
+        # Only mark entries as seen once they've actually been sent
+        processor.save_feed_state(articles)
+    finally:
+        # Release the worker pool, pooled connections and databases
+        processor.close()
 
-🔗 Source: {summary['source_url']}
-📅 Published: {summary['published']}
-
-📝 SUMMARY:
-{summary['detailed_summary']}
-
-🔍 KEY POINTS:
-{summary['key_points']}
-
-{'='*60}
-
-"""
+def run_subscriptions(metrics, subscriptions):
+    """Fetch and summarise each article once, then email every topic digest to its recipients"""
+    processor = create_processor(metrics, feeds=subscriptions.feeds)
+    
+    try:
+        logger.info("Fetching news for all topics...")
+        routed = processor.fetch_topics(subscriptions.active_topics)
         
-        body += f"""
-Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
-Powered by your AI News Bot 🤖
-"""
+        # Articles shared between topics are summarised once
+        unique_articles = list({article['url']: article for articles in routed.values() for article in articles}.values())
+        if not unique_articles:
+            logger.warning("No articles found")
+            return
         
-        # Send email
-        send_email(subject, body)
-        logger.info("Email sent successfully!")
+        logger.info(f"Found {len(unique_articles)} articles across {len(routed)} topics, processing...")
+        summaries = processor.generate_detailed_summaries(unique_articles)
+        summary_by_url = {article['url']: summary for article, summary in zip(unique_articles, summaries)}
         
-    except Exception as e:
-        logger.error(f"Error in main execution: {e}")
-        raise
+        # Render each topic once and address a copy to each subscriber
+        messages = []
+        digests = []
+        with metrics.stage('render'):
+            renderer = DigestRenderer()
+            for topic in subscriptions.active_topics:
+                stories = [summary_by_url[article['url']] for article in routed.get(topic.name, [])]
+                if not stories:
+                    logger.warning(f"No articles for {topic.name}, skipping its digest")
+                    continue
+            
+                digest = Digest(stories, heading=topic.heading, intro=topic.intro)
+                body, html_body = renderer.render(digest)
+                topic_messages = [(recipient, digest.subject, body, html_body)
+                                  for recipient in subscriptions.recipients_for(topic.name)]
+                digests.append((digest, routed[topic.name], topic_messages))
+                messages.extend(topic_messages)
+        
+        # One SMTP login for every message; if sending breaks off, what did go
+        # out is still recorded before the error is raised
+        send_error = None
+        with metrics.stage('send'):
+            try:
+                sent = send_emails(messages)
+            except PartialSendError as e:
+                sent, send_error = e.sent, e
+        logger.info(f"Sent {len(sent)} of {len(messages)} emails")
+        
+        # A digest counts as delivered once it reached at least one subscriber; only
+        # then is it archived (which stops its stories being sent again) and are its
+        # entries marked seen
+        delivered = [(digest, articles) for digest, articles, topic_messages in digests
+                     if any(message in sent for message in topic_messages)]
+        for digest, _ in delivered:
+            processor.archive_digest(digest)
+        processor.save_feed_state([article for _, articles in delivered for article in articles])
+        
+        if send_error:
+            raise send_error
+    finally:
+        # Release the worker pool, pooled connections and databases
+        processor.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,191 @@
+# model_registry.py
+import json
+import logging
+import os
+import threading
+import time
+
+from inference_backends import load_seq2seq
+
+logger = logging.getLogger(__name__)
+
+# Summarisation models in order of preference
+DEFAULT_MODELS = [
+    ("facebook/bart-large-cnn", "BART Large CNN"),
+    ("t5-small", "T5 Small"),
+    ("t5-base", "T5 Base"),
+    ("google/pegasus-xsum", "Pegasus XSum")
+]
+
+# Load errors that will happen again on the next attempt; anything else (a
+# network or hub hiccup) is only remembered for a few hours
+PERMANENT_ERROR_MARKERS = (
+    'is not a valid model identifier', 'repository not found', '404 client error',
+    'does not appear to have a file', 'unrecognized configuration class', 'unrecognized model',
+    'out of memory', 'needs optimum',
+)
+
+def is_permanent_failure(error):
+    """True for load failures that retrying won't fix (missing model, OOM, unsupported architecture)"""
+    if isinstance(error, (MemoryError, ImportError, KeyError)):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in PERMANENT_ERROR_MARKERS)
+
+class ModelRegistry:
+    def __init__(self, failure_path=None, failure_ttl=7 * 24 * 3600, transient_failure_ttl=3 * 3600):
+        # Loaded pipelines are shared by everything in the process
+        self._pipelines = {}
+        self._lock = threading.RLock()
+        self._failure_path = None
+        self._failures = {}
+        self.failure_ttl = failure_ttl
+        self.transient_failure_ttl = transient_failure_ttl
+        # Converted (quantized / ONNX) models are kept here between runs
+        self.artefact_dir = None
+
+        if failure_path:
+            self.use_failure_store(failure_path)
+
+    def use_cache_dir(self, cache_dir):
+        """Keep the failure store and converted models under a cache directory"""
+        self.use_failure_store(os.path.join(cache_dir, 'model_failures.json'))
+        self.artefact_dir = os.path.join(cache_dir, 'models')
+
+    def use_failure_store(self, path):
+        """Persist failed load attempts to a JSON file so later runs skip known-bad models"""
+        with self._lock:
+            if path == self._failure_path:
+                return
+            self._failure_path = path
+            try:
+                with open(path) as f:
+                    self._failures = json.load(f)
+            except FileNotFoundError:
+                self._failures = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable model failure store {path}: {e}")
+                self._failures = {}
+
+    def is_known_bad(self, model_name):
+        """True if the model failed to load recently"""
+        failure = self._failures.get(model_name)
+        return bool(failure) and time.time() - failure['failed_at'] < failure.get('ttl', self.failure_ttl)
+
+    def candidate(self, models=DEFAULT_MODELS):
+        """Name of the model that would be used, without loading anything"""
+        with self._lock:
+            for model_name, _ in models:
+                if model_name in self._pipelines or not self.is_known_bad(model_name):
+                    return model_name
+            return None
+
+    def effective_backend(self, model_name, backend='pytorch'):
+        """Backend load() serves (or would serve) for this model: the requested one, or pytorch after a fallback"""
+        if backend == 'pytorch':
+            return backend
+        key = f"{model_name}@{backend}"
+        with self._lock:
+            if key in self._pipelines:
+                return backend
+            if self.is_known_bad(key):
+                return 'pytorch'
+        return backend
+
+    def first_available(self, models=DEFAULT_MODELS, backend='pytorch'):
+        """Load the first usable model from the list, returning (model_name, pipeline)"""
+        for model_name, model_desc in models:
+            summarizer = self.load(model_name, model_desc, backend=backend)
+            if summarizer is not None:
+                return model_name, summarizer
+        return None, None
+
+    def load(self, model_name, model_desc=None, backend='pytorch'):
+        """Return the pipeline for a model, loading it on first use; None if it can't be loaded
+
+        A non-default backend that fails falls back to the plain pytorch model.
+        """
+        model_desc = model_desc or model_name
+
+        if backend != 'pytorch':
+            summarizer = self._load_key(f"{model_name}@{backend}", model_name,
+                                        f"{model_desc} ({backend})", backend)
+            if summarizer is not None:
+                return summarizer
+            logger.warning(f"Falling back to the pytorch backend for {model_desc}")
+
+        return self._load_key(model_name, model_name, model_desc, 'pytorch')
+
+    def _load_key(self, key, model_name, model_desc, backend):
+        """Load and remember one model/backend combination"""
+        with self._lock:
+            if key in self._pipelines:
+                return self._pipelines[key]
+
+            if self.is_known_bad(key):
+                failure = self._failures[key]
+                logger.info(f"Skipping {model_desc} model: failed to load within the last "
+                            f"{failure.get('ttl', self.failure_ttl) // 3600}h ({failure['error']})")
+                return None
+
+            # Check the local cache first; only go to the network if the model isn't there
+            try:
+                summarizer = self._build_pipeline(model_name, backend, local_files_only=True)
+                logger.info(f"Loaded {model_desc} model from local cache")
+            except Exception as local_error:
+                logger.info(f"{model_desc} model not available locally ({local_error}), downloading...")
+                try:
+                    summarizer = self._build_pipeline(model_name, backend, local_files_only=False)
+                    logger.info(f"Successfully loaded {model_desc} model")
+                except Exception as e:
+                    logger.warning(f"Failed to load {model_desc} model: {e}")
+                    self._record_failure(key, e)
+                    return None
+
+            self._pipelines[key] = summarizer
+            self._clear_failure(key)
+            return summarizer
+
+    def _build_pipeline(self, model_name, backend, local_files_only):
+        """Construct a summarisation pipeline for a model"""
+        # Imported here so importing this module doesn't pull in torch
+        from transformers import pipeline
+
+        model, tokenizer = load_seq2seq(model_name, backend=backend, local_files_only=local_files_only,
+                                        artefact_dir=self.artefact_dir)
+        return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+    def _record_failure(self, key, error):
+        """Remember a failed load: for failure_ttl if it will repeat, briefly if it may be transient"""
+        ttl = self.failure_ttl if is_permanent_failure(error) else self.transient_failure_ttl
+        self._failures[key] = {'failed_at': time.time(), 'error': str(error)[:200], 'ttl': ttl}
+        self._save_failures()
+
+    def _clear_failure(self, key):
+        """Forget an earlier failure once a model loads"""
+        if self._failures.pop(key, None) is not None:
+            self._save_failures()
+
+    def _save_failures(self):
+        """Write the failure store to disk"""
+        if not self._failure_path:
+            return
+        try:
+            directory = os.path.dirname(self._failure_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self._failure_path, 'w') as f:
+                json.dump(self._failures, f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not save model failure store: {e}")
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    """Process-wide model registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -1,227 +1,663 @@
 # news_processor.py
-import feedparser
 import newspaper
-from transformers import pipeline
-from datetime import datetime
+from feed_fetcher import FeedFetcher
+from http_client import HttpClient
+from feed_state import FeedStateStore
+from dedup_index import DedupIndex, normalise_tokens
+from key_points import KeyPointExtractor
+from ranking import RelevanceRanker
+from text_chunker import chunk_sentences
+from generation_policy import GenerationPolicy
+from article_pipeline import ArticlePipeline
+from batch_summarizer import BatchSummarizer
+from summary_cache import SummaryCache
+from digest_archive import DigestArchive
+from model_registry import DEFAULT_MODELS, get_registry
+from instrumentation import RunMetrics
+from run_budget import FULL, SIMPLE
+from summary_workers import ProcessPoolSummarizer, fork_available
+from feed_parser import parse_date
 import logging
-import time
+import os
 import re
 
 logger = logging.getLogger(__name__)
 
 class NewsProcessor:
-    def __init__(self):
-        # Initialize summarization pipeline with robust fallbacks
-        self.summarizer = None
-        
-        # Try different models in order of preference
-        models_to_try = [
-            ("facebook/bart-large-cnn", "BART Large CNN"),
-            ("t5-small", "T5 Small"),
-            ("t5-base", "T5 Base"),
-            ("google/pegasus-xsum", "Pegasus XSum")
-        ]
-        
-        for model_name, model_desc in models_to_try:
-            try:
-                logger.info(f"Attempting to load {model_desc} model...")
-                self.summarizer = pipeline(
-                    "summarization", 
-                    model=model_name,
-                    tokenizer=model_name
-                )
-                logger.info(f"Successfully loaded {model_desc} model")
-                break
-            except Exception as e:
-                logger.warning(f"Failed to load {model_desc} model: {e}")
-                continue
+    # Multiple RSS feeds for better coverage
+    DEFAULT_FEEDS = [
+        "https://news.google.com/rss/search?q=artificial+intelligence&hl=en&gl=US&ceid=US:en",
+        "https://techcrunch.com/tag/ai/feed/",
+        "https://www.theverge.com/rss/ai-artificial-intelligence/index.xml",
+        "https://feeds.feedburner.com/oreilly/radar",
+    ]
+
+    def __init__(self, feeds=None, feed_timeout=10, fetch_deadline=30,
+                 extract_workers=4, per_host_limit=1, host_interval=1.0,
+                 summary_batch_size=8, cache_dir=None, models=None, only_new_entries=False,
+                 dedup_on_body=False, metrics=None, summary_workers=1, torch_threads=None,
+                 inference_backend='pytorch', key_point_ranking=None, budget=None,
+                 generation_preset='quality', max_feed_entries=50, archive_days=30,
+                 rank_articles=True, source_weights=None):
+        self.feeds = list(feeds) if feeds is not None else list(self.DEFAULT_FEEDS)
         
-        # If all models fail, create a simple fallback
-        if self.summarizer is None:
-            logger.error("All summarization models failed to load. Using simple text truncation.")
-            self.summarizer = None
+        # Stage timers and counters for the run report
+        self.metrics = metrics or RunMetrics()
+        
+        # Optional RunBudget: once time runs short, summaries degrade from full
+        # map-reduce to a single pass to the extractive fallback
+        self.budget = budget
+        
+        # With rank_articles every parsed entry is scored on its RSS title and summary
+        # (topic keywords, recency, source_weights) and only the best are downloaded;
+        # otherwise the first entries of each feed are taken in feed order
+        self.source_weights = source_weights or {}
+        self.ranker = RelevanceRanker(source_weights=self.source_weights) if rank_articles else None
+        
+        # Also treat articles with near-identical RSS summaries as duplicates
+        self.dedup_on_body = dedup_on_body
+        
+        # With only_new_entries, feeds are polled with conditional GETs and entries
+        # delivered on an earlier run (see save_feed_state) are skipped
+        self.feed_state = None
+        if only_new_entries:
+            state_path = os.path.join(cache_dir, 'feed_state.json') if cache_dir else None
+            self.feed_state = FeedStateStore(state_path)
+        
+        # Feeds and articles share one pooled keep-alive session, so repeat visits
+        # to the same host skip the TCP/TLS handshake; its per-host cap is a hard
+        # ceiling above the article throttle below
+        self.http = HttpClient(timeout=feed_timeout, max_per_host=max(per_host_limit, 4))
+        self.feed_fetcher = FeedFetcher(feed_timeout=feed_timeout, deadline=fetch_deadline,
+                                        state=self.feed_state, metrics=self.metrics, http=self.http,
+                                        max_entries=max_feed_entries)
+        
+        # Article downloads are throttled per host instead of sleeping after every article;
+        # cache hits are served without waiting for a host slot
+        self.article_pipeline = ArticlePipeline(
+            self.download_article_content,
+            max_workers=extract_workers,
+            max_per_host=per_host_limit,
+            host_interval=host_interval,
+            cached_fn=self.cached_article_content
+        )
+        
+        # Number of chunks per forward pass when summarising
+        self.summary_batch_size = summary_batch_size
+        
+        # With summary_workers > 1 inference runs in forked processes sharing the
+        # model weights; torch_threads sets intra-op threads per process
+        self.summary_workers = summary_workers
+        self.torch_threads = torch_threads
+        
+        # Summary length follows input length; the preset trades beam width for speed
+        self.generation = GenerationPolicy(generation_preset)
+        
+        # Long articles are summarised chunk by chunk; more than max_summary_parts
+        # partial summaries are reduced again (summary of summaries)
+        self.max_summary_parts = 3
+        self.max_reduce_rounds = 4
+        
+        # Key points are keyword-scored sentences, optionally re-ranked by
+        # 'tfidf' or 'textrank' centrality
+        self.key_point_extractor = KeyPointExtractor(ranking=key_point_ranking)
+        
+        # Optional on-disk cache of extracted text and summaries shared between runs
+        self.cache = SummaryCache(os.path.join(cache_dir, 'summaries.sqlite')) if cache_dir else None
+        
+        # Archive of sent digests; stories sent within archive_days are skipped
+        # before anything is downloaded
+        self.archive = DigestArchive(os.path.join(cache_dir, 'digest_archive.sqlite')) if cache_dir else None
+        self.archive_days = archive_days
+        
+        # Summarisation models load lazily on first use via the shared registry;
+        # inference_backend is 'pytorch', 'quantized' (int8) or 'onnx'
+        self.models = list(models) if models is not None else list(DEFAULT_MODELS)
+        self.inference_backend = inference_backend
+        self.registry = get_registry()
+        if cache_dir:
+            self.registry.use_cache_dir(cache_dir)
+        self._summarizer = None
+        self._model_name = None
+        self._summarizer_resolved = False
+        
+        # The worker pool forks from this process, which is only safe before any
+        # extraction or fetch threads exist, so it can't be started lazily mid-run
+        if self.summary_workers > 1:
+            self.warm_up()
+    
+    def warm_up(self):
+        """Load the summarisation model (and start any worker pool) now rather than on first use"""
+        return self.summarizer is not None
+    
+    @property
+    def summarizer(self):
+        """Summarisation pipeline, loaded with fallbacks on first access"""
+        if not self._summarizer_resolved:
+            with self.metrics.stage('model_load'):
+                self._model_name, self._summarizer = self.registry.first_available(
+                    self.models, backend=self.inference_backend)
+                if self._summarizer is not None:
+                    self._summarizer = self._configure_inference(self._summarizer)
+            self._summarizer_resolved = True
+            
+            # If all models fail, create a simple fallback
+            if self._summarizer is None:
+                logger.error("All summarization models failed to load. Using simple text truncation.")
+                self.metrics.incr('fallback.no_model')
+        return self._summarizer
+    
+    @summarizer.setter
+    def summarizer(self, summarizer):
+        self._summarizer = summarizer
+        self._summarizer_resolved = True
+    
+    def _configure_inference(self, summarizer):
+        """Apply thread settings and, if requested, move inference into a worker pool"""
+        if self.summary_workers > 1:
+            if fork_available():
+                return ProcessPoolSummarizer(summarizer, workers=self.summary_workers,
+                                             torch_threads=self.torch_threads)
+            logger.warning("Process pool summarisation needs fork; running in-process instead")
+        
+        if self.torch_threads:
+            import torch
+            torch.set_num_threads(self.torch_threads)
+        return summarizer
+    
+    def close(self):
+        """Release worker processes, pooled connections and the cache"""
+        if isinstance(self._summarizer, ProcessPoolSummarizer):
+            self._summarizer.close()
+        self.http.close()
+        if self.cache:
+            self.cache.close()
+        if self.archive:
+            self.archive.close()
+    
+    @property
+    def model_name(self):
+        """Name of the loaded model, or the one that would be loaded, without loading it"""
+        if self._summarizer_resolved:
+            return self._model_name
+        return self.registry.candidate(self.models)
+    
+    @model_name.setter
+    def model_name(self, model_name):
+        self._model_name = model_name
     
     def fetch_ai_news(self, num_articles=5):
         """Fetch AI news from multiple sources"""
+        return self.fetch_news(num_articles)
+    
+    def fetch_news(self, num_articles=5, feeds=None):
+        """Fetch the top unique articles from the given feeds (default: this processor's feeds)"""
         articles = []
         
-        # Multiple RSS feeds for better coverage
-        feeds = [
-            "https://news.google.com/rss/search?q=artificial+intelligence&hl=en&gl=US&ceid=US:en",
-            "https://techcrunch.com/tag/ai/feed/",
-            "https://www.theverge.com/rss/ai-artificial-intelligence/index.xml",
-            "https://feeds.feedburner.com/oreilly/radar",
-        ]
+        if self.ranker:
+            # Every parsed entry is a candidate; ranking decides which get downloaded.
+            # Candidates below the cut aren't marked seen, so they compete again next run
+            for feed_articles in self.fetch_entries(feeds, per_feed=None).values():
+                articles.extend(feed_articles)
+            with self.metrics.stage('rank'):
+                relevant, irrelevant = self.ranker.partition(articles)
+            # Off-topic entries would never be picked, so they stop being candidates;
+            # they still fill the list if there aren't enough relevant ones
+            self.mark_delivered(irrelevant)
+            self.metrics.incr('articles_irrelevant', len(irrelevant))
+            articles = relevant + irrelevant
+        else:
+            for feed_articles in self.fetch_entries(feeds, per_feed=num_articles).values():
+                for article_data in feed_articles:
+                    articles.append(article_data)
+                    
+                    # Limit total articles
+                    if len(articles) >= num_articles * 2:
+                        break
+        
+        # Remove duplicates based on title similarity
+        with self.metrics.stage('dedup'):
+            unique_articles = self._skip_already_sent(self._remove_duplicates(articles))
+        self.metrics.incr('articles_fetched', len(articles))
+        self.metrics.incr('articles_held_back', max(0, len(unique_articles) - num_articles))
+        
+        return unique_articles[:num_articles]
+    
+    def fetch_topics(self, topics):
+        """Fetch every topic's feeds in one pass and pick each topic's articles
+        
+        Returns {topic name: [article]}; an article that suits several topics is
+        the same dict in each list, so it only needs summarising once.
+        """
+        feeds = list(dict.fromkeys(feed for topic in topics for feed in topic.feeds))
+        per_feed = None if self.ranker else max((topic.max_articles for topic in topics), default=0)
+        entries = self.fetch_entries(feeds, per_feed=per_feed)
+        
+        routed = {}
+        candidates_by_topic = []
+        for topic in topics:
+            candidates = [article for feed in topic.feeds for article in entries.get(feed, [])
+                          if topic.matches(article)]
+            candidates_by_topic.append(candidates)
+            if self.ranker:
+                with self.metrics.stage('rank'):
+                    ranker = RelevanceRanker(topic.keywords or {}, source_weights=self.source_weights)
+                    candidates = ranker.rank(candidates)
+            with self.metrics.stage('dedup'):
+                selected = self._skip_already_sent(self._remove_duplicates(candidates))
+            # Ones below the cut stay unseen for the next run
+            self.metrics.incr('articles_held_back', max(0, len(selected) - topic.max_articles))
+            routed[topic.name] = selected[:topic.max_articles]
+            logger.info(f"{topic.name}: {len(routed[topic.name])} of {len(candidates)} matching articles selected")
+        
+        # Entries no topic wants would never be picked, so they stop being candidates
+        wanted = {article['url'] for articles in candidates_by_topic for article in articles}
+        self.mark_delivered(article for articles in entries.values() for article in articles
+                            if article['url'] not in wanted)
         
-        for feed_url in feeds:
+        self.metrics.incr('articles_fetched', sum(len(articles) for articles in entries.values()))
+        return routed
+    
+    def fetch_entries(self, feeds=None, per_feed=5):
+        """Fetch feeds concurrently and return up to per_feed (None: all) article dicts per feed URL, in feed order"""
+        feeds = self.feeds if feeds is None else feeds
+        entries = {}
+        
+        # Feeds are fetched concurrently but merged in the configured order
+        with self.metrics.stage('fetch'):
+            fetched = self.feed_fetcher.fetch_all(feeds)
+        
+        for feed_url, feed in fetched:
+            if feed is None:
+                continue
+            
+            feed_articles = entries.setdefault(feed_url, [])
             try:
-                logger.info(f"Fetching from: {feed_url}")
-                feed = feedparser.parse(feed_url)
-                
-                for entry in feed.entries[:num_articles]:
+                for entry in feed.entries[:per_feed]:
                     article_data = {
                         'title': entry.title,
                         'url': entry.link,
-                        'published': getattr(entry, 'published', 'Unknown'),
-                        'summary': getattr(entry, 'summary', ''),
-                        'source': feed.feed.get('title', 'Unknown Source')
+                        'published': entry.published or 'Unknown',
+                        'published_at': entry.published_at,
+                        'summary': entry.summary or '',
+                        'source': feed.title or 'Unknown Source',
+                        'feed_url': feed_url,
+                        'entry_id': FeedStateStore.entry_id(entry)
                     }
-                    articles.append(article_data)
-                    
-                    # Limit total articles
-                    if len(articles) >= num_articles * 2:
-                        break
+                    feed_articles.append(article_data)
                         
             except Exception as e:
-                logger.error(f"Error fetching from {feed_url}: {e}")
+                logger.error(f"Error reading entries from {feed_url}: {e}")
                 continue
         
-        # Remove duplicates based on title similarity
-        unique_articles = self._remove_duplicates(articles)
+        return entries
+    
+    def archive_digest(self, digest):
+        """Record a sent digest so it can be searched and its stories aren't sent again"""
+        if self.archive:
+            self.archive.add_digest(digest.subject, digest.stories)
+    
+    def _skip_already_sent(self, articles):
+        """Drop articles that went out in a recent digest"""
+        if not self.archive:
+            return articles
+        fresh = self.archive.filter_new(articles, days=self.archive_days)
+        self.metrics.incr('articles_already_sent', len(articles) - len(fresh))
         
-        return unique_articles[:num_articles]
+        # Entries that were already sent needn't be offered again either
+        fresh_urls = {article['url'] for article in fresh}
+        self.mark_delivered(article for article in articles if article['url'] not in fresh_urls)
+        return fresh
+    
+    def mark_delivered(self, articles):
+        """Record the articles' feed entries as seen (sent, or never worth sending), so later runs skip them"""
+        if not self.feed_state:
+            return
+        by_feed = {}
+        for article in articles:
+            if article.get('feed_url') and article.get('entry_id'):
+                by_feed.setdefault(article['feed_url'], []).append(article['entry_id'])
+        for feed_url, entry_ids in by_feed.items():
+            self.feed_state.mark_seen(feed_url, entry_ids)
+    
+    def save_feed_state(self, delivered=()):
+        """Mark the delivered articles as seen and persist feed state
+        
+        Entries that were fetched but not delivered stay unseen and are offered again next run.
+        """
+        if self.feed_state:
+            self.mark_delivered(delivered)
+            self.feed_state.save()
     
     def _remove_duplicates(self, articles):
-        """Remove duplicate articles based on title similarity"""
+        """Remove duplicate articles based on title (and optionally body) similarity"""
         unique_articles = []
-        seen_titles = set()
         
-        for article in articles:
-            # Normalize title for comparison
-            normalized_title = re.sub(r'[^\w\s]', '', article['title'].lower())
+        # Normalize titles for comparison
+        titles = [normalise_tokens(article['title']) for article in articles]
+        
+        # Token indexes keep the lookup near-linear instead of comparing every pair
+        seen_titles = DedupIndex(threshold=0.8, corpus=titles)
+        seen_bodies = DedupIndex(threshold=0.8) if self.dedup_on_body else None
+        
+        for article, title_tokens in zip(articles, titles):
+            if seen_titles.find_duplicate(title_tokens) is not None:
+                continue
             
-            # Check if we've seen a similar title
-            is_duplicate = False
-            for seen_title in seen_titles:
-                if self._calculate_similarity(normalized_title, seen_title) > 0.8:
-                    is_duplicate = True
-                    break
+            body_tokens = None
+            if seen_bodies is not None:
+                body_tokens = normalise_tokens(re.sub(r'<[^>]+>', ' ', article.get('summary', '')))
+                # Very short bodies (e.g. bare links) say nothing about duplication
+                if len(body_tokens) < 10:
+                    body_tokens = None
+                elif seen_bodies.find_duplicate(body_tokens) is not None:
+                    continue
             
-            if not is_duplicate:
-                unique_articles.append(article)
-                seen_titles.add(normalized_title)
+            unique_articles.append(article)
+            seen_titles.add(title_tokens)
+            if body_tokens is not None:
+                seen_bodies.add(body_tokens)
         
         return unique_articles
     
-    def _calculate_similarity(self, text1, text2):
-        """Simple similarity calculation"""
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        return len(intersection) / len(union) if union else 0
-    
     def extract_article_content(self, url):
         """Extract full article content from URL"""
+        cached = self.cached_article_content(url)
+        if cached is not None:
+            return cached
+        return self.download_article_content(url)
+    
+    def cached_article_content(self, url):
+        """Previously extracted content for the URL, or None"""
+        if not self.cache:
+            return None
+        with self.metrics.article_stage(url, 'extract'):
+            cached = self.cache.get_article(url)
+        if cached:
+            logger.info(f"Using cached content for {url}")
+            self.metrics.incr('article_cache_hits')
+            return cached
+        self.metrics.incr('article_cache_misses')
+        return None
+    
+    def download_article_content(self, url):
+        """Download and parse one article, skipping the cache lookup"""
+        with self.metrics.article_stage(url, 'extract'):
+            return self._download_article_content(url)
+    
+    def _download_article_content(self, url):
+        """Download and parse for one article, caching the extracted text"""
         try:
+            # Download through the pooled client; newspaper only parses. Under a run
+            # budget a download may not outlast the time that's left
+            total_timeout = max(1.0, self.budget.remaining()) if self.budget else None
+            response = self.http.get(url, total_timeout=total_timeout)
+            response.raise_for_status()
+            self.metrics.incr('bytes_downloaded.articles', len(response.content))
+            self.metrics.incr('bytes_transferred.articles', response.wire_bytes)
+            
             article = newspaper.Article(url)
-            article.download()
+            article.download(input_html=response.text)
             article.parse()
             
-            return {
+            content = {
                 'text': article.text,
                 'authors': article.authors,
                 'publish_date': article.publish_date,
                 'top_image': article.top_image
             }
+            
+            if self.cache and content['text']:
+                self.cache.put_article(url, content)
+            
+            return content
         except Exception as e:
             logger.error(f"Error extracting content from {url}: {e}")
+            self.metrics.incr('extract_failures')
             return None
     
     def generate_detailed_summaries(self, articles):
         """Generate detailed summaries for each article"""
-        detailed_summaries = []
+        batch = self._new_batch()
+        planned = []
+        # Articles are in priority order; ones not planned yet keep a claim on model time
+        unplanned = set(range(len(articles)))
         
-        for i, article in enumerate(articles, 1):
-            logger.info(f"Processing article {i}/{len(articles)}: {article['title']}")
+        def summarise(index, article, content):
+            logger.info(f"Processing article {index + 1}/{len(articles)}: {article['title']}")
+            unplanned.discard(index)
+            reserved_chunks = sum(1 for other in unplanned if other < index)
             
             try:
-                # Extract full article content
-                content = self.extract_article_content(article['url'])
-                
-                if content and content['text']:
-                    # Use full article text for summarization
-                    text_to_summarize = content['text']
-                else:
-                    # Fallback to RSS summary
-                    text_to_summarize = article['summary']
-                
-                # Generate detailed summary
-                detailed_summary = self._create_detailed_summary(text_to_summarize)
-                
-                # Extract key points
-                key_points = self._extract_key_points(text_to_summarize)
-                
-                summary_data = {
-                    'title': article['title'],
-                    'source_url': article['url'],
-                    'published': self._format_date(article['published']),
-                    'detailed_summary': detailed_summary,
-                    'key_points': key_points,
-                    'source': article['source']
-                }
-                
-                detailed_summaries.append(summary_data)
-                
-                # Add delay to avoid overwhelming servers
-                time.sleep(1)
+                with self.metrics.article_stage(article['url'], 'process'):
+                    summary_data, plan = self._summarise_article(article, content, batch, reserved_chunks)
+                planned.append((summary_data, plan))
                 
+                # Run the model once enough chunks have queued up to fill sorted batches
+                batch.flush_if_ready()
+                return summary_data
             except Exception as e:
                 logger.error(f"Error processing article {article['title']}: {e}")
+                self.metrics.incr('fallback.error_record')
                 # Add a minimal summary even if processing fails
-                detailed_summaries.append({
+                return {
                     'title': article['title'],
                     'source_url': article['url'],
                     'published': self._format_date(article['published']),
                     'detailed_summary': article.get('summary', 'Summary unavailable'),
                     'key_points': '• Content extraction failed',
                     'source': article['source']
-                })
+                }
+        
+        with self.metrics.stage('extract_and_summarise'):
+            # Downloads run in a politeness-limited worker pool while summarisation
+            # consumes finished extractions on this thread
+            deadline = self.budget.deadline if self.budget else None
+            detailed_summaries = self.article_pipeline.run(articles, summarise, deadline=deadline)
+            
+            # Summarise whatever is still queued and scatter results back to their articles
+            self._finish_summaries(planned, batch)
+        self.metrics.incr('articles_summarised', len(detailed_summaries))
+        if self.budget:
+            logger.info(f"Summaries done after {self.budget.elapsed():.0f}s, "
+                        f"{self.budget.remaining():.0f}s of the time budget left")
         
         return detailed_summaries
     
+    def _summarise_article(self, article, content, batch, reserved_chunks=0):
+        """Build the summary record for one article, queueing its model inputs on the batch"""
+        if content and content['text']:
+            # Use full article text for summarization
+            text_to_summarize = content['text']
+        else:
+            # Fallback to RSS summary
+            text_to_summarize = article['summary']
+            self.metrics.incr('fallback.rss_summary')
+        
+        # Queue detailed summary; the text is filled in once the batch has run
+        plan = self._plan_summary(text_to_summarize, batch, reserved_chunks)
+        
+        # Extract key points
+        key_points = self._extract_key_points(text_to_summarize)
+        
+        summary_data = {
+            'title': article['title'],
+            'source_url': article['url'],
+            'published': self._format_date(article['published']),
+            'detailed_summary': None,
+            'key_points': key_points,
+            'source': article['source']
+        }
+        return summary_data, plan
+    
+    def _new_batch(self):
+        """Create a batching engine; the summarizer is only loaded once a batch runs"""
+        return BatchSummarizer(lambda: self.summarizer, batch_size=self.summary_batch_size,
+                               metrics=self.metrics,
+                               seconds_per_item=self.budget.seconds_per_chunk() if self.budget else 0.0)
+    
     def _create_detailed_summary(self, text):
         """Create a detailed summary of the article"""
+        batch = self._new_batch()
+        summary_data = {}
+        self._finish_summaries([(summary_data, self._plan_summary(text, batch))], batch)
+        return summary_data['detailed_summary']
+    
+    def _finish_summaries(self, planned, batch):
+        """Run queued model work and fill in each record's summary, including reduce rounds"""
+        while planned:
+            batch.flush(deadline=self.budget.deadline if self.budget else None)
+            
+            # Long documents may queue another round of summary-of-summaries
+            still_running = []
+            for summary_data, plan in planned:
+                summary = self._assemble_summary(plan, batch)
+                if summary is None:
+                    still_running.append((summary_data, plan))
+                else:
+                    summary_data['detailed_summary'] = summary
+                    if summary_data.get('source_url') and plan.get('inference_seconds'):
+                        self.metrics.add_article_time(summary_data['source_url'], 'inference',
+                                                      plan['inference_seconds'])
+            planned = still_running
+    
+    def _plan_summary(self, text, batch, reserved_chunks=0):
+        """Queue the model inputs needed to summarise text and return a plan for assembly
+        
+        reserved_chunks is model time held back for higher-priority articles still to come.
+        """
         if not text or len(text.strip()) < 100:
-            return "Detailed summary unavailable - insufficient content."
+            self.metrics.incr('fallback.insufficient_content')
+            return {'summary': "Detailed summary unavailable - insufficient content."}
+        
+        # A cache hit avoids loading the model at all
+        if self.cache:
+            cached = self.cache.get_summary(text, self._cache_model_key())
+            if cached:
+                self.metrics.incr('summary_cache_hits')
+                return {'summary': cached}
+            self.metrics.incr('summary_cache_misses')
+        
+        # Out of time: don't even load the model
+        if self.budget and not self.budget.can_afford(1, batch.pending_count + reserved_chunks):
+            self.metrics.incr(f"budget.{SIMPLE}")
+            return {'summary': self._simple_summary(text)}
         
         # If no summarizer available, use simple text truncation
         if self.summarizer is None:
-            return self._simple_summary(text)
+            self.metrics.incr('fallback.simple_summary')
+            return {'summary': self._simple_summary(text)}
         
         try:
             # Clean and prepare text
             cleaned_text = self._clean_text(text)
             
-            # Split into chunks if text is too long
-            max_chunk_length = 1000
-            if len(cleaned_text) > max_chunk_length:
-                chunks = [cleaned_text[i:i+max_chunk_length] 
-                         for i in range(0, len(cleaned_text), max_chunk_length)]
-                
-                summaries = []
-                for chunk in chunks[:3]:  # Limit to 3 chunks
-                    try:
-                        summary = self.summarizer(chunk, 
-                                                max_length=150, 
-                                                min_length=50, 
-                                                do_sample=False)
-                        summaries.append(summary[0]['summary_text'])
-                    except Exception as e:
-                        logger.warning(f"Error summarizing chunk: {e}")
-                        summaries.append(chunk[:200] + "...")
-                
-                return ' '.join(summaries)
+            # Pack whole sentences into chunks that fill the model's input window
+            chunks = chunk_sentences(cleaned_text, getattr(self.summarizer, 'tokenizer', None))
+            
+            tier = FULL
+            if self.budget:
+                # Long documents need a reduce round on top of their chunks
+                full_cost = len(chunks) + (1 if len(chunks) > self.max_summary_parts else 0)
+                tier = self.budget.choose_tier(full_cost, batch.pending_count, reserved_chunks)
+                self.metrics.incr(f"budget.{tier}")
+            
+            if tier == SIMPLE:
+                return {'summary': self._simple_summary(text)}
+            elif len(chunks) > 1 and tier == FULL:
+                plan = {'text': text, 'complete': True, 'rounds': 0}
+                self._queue_chunks(plan, chunks, batch)
+                return plan
             else:
-                summary = self.summarizer(cleaned_text, 
-                                        max_length=200, 
-                                        min_length=100, 
-                                        do_sample=False)
-                return summary[0]['summary_text']
+                # Single pass; under time pressure long articles only get their opening window
+                single_text = chunks[0] if len(chunks) > 1 else cleaned_text
+                ticket = batch.add(single_text, **self.generation.kwargs(
+                    single_text, getattr(self.summarizer, 'tokenizer', None), role='article'))
+                return {'text': text, 'chunks': None, 'tickets': [ticket], 'complete': len(chunks) <= 1}
                 
         except Exception as e:
             logger.error(f"Error creating detailed summary: {e}")
-            return self._simple_summary(text)
+            self.metrics.incr('fallback.simple_summary')
+            return {'summary': self._simple_summary(text)}
+    
+    def _queue_chunks(self, plan, chunks, batch):
+        """Queue one summarisation round over a document's chunks"""
+        plan['chunks'] = chunks
+        tokenizer = getattr(self.summarizer, 'tokenizer', None)
+        plan['tickets'] = [batch.add(chunk, **self.generation.kwargs(chunk, tokenizer, role='chunk'))
+                           for chunk in chunks]
+        plan['rounds'] += 1
+    
+    def _assemble_summary(self, plan, batch):
+        """Collect batch results for a plan into the final summary text
+
+        Returns None when another reduce round has been queued on the batch.
+        """
+        if 'summary' in plan:
+            return plan['summary']
+        
+        try:
+            plan['inference_seconds'] = plan.get('inference_seconds', 0) + sum(
+                batch.seconds(ticket) for ticket in plan['tickets'])
+            
+            if plan['chunks'] is None:
+                summary = batch.result(plan['tickets'][0])
+                if summary is None:
+                    raise RuntimeError("model returned no summary")
+                if plan.get('complete', True):
+                    self._cache_summary(plan['text'], summary)
+                return summary
+            
+            summaries = []
+            for chunk, ticket in zip(plan['chunks'], plan['tickets']):
+                summary = batch.result(ticket)
+                if summary is None:
+                    # Failed chunks fall back to their leading text
+                    summaries.append(chunk[:200] + "...")
+                    self.metrics.incr('fallback.chunk_text')
+                    plan['complete'] = False
+                else:
+                    summaries.append(summary)
+            
+            # Map-reduce: too many partial summaries get summarised again as a new document
+            if len(summaries) > self.max_summary_parts and plan['rounds'] < self.max_reduce_rounds:
+                combined = ' '.join(summaries)
+                chunks = chunk_sentences(combined, getattr(self.summarizer, 'tokenizer', None))
+                if self.budget is None or self.budget.can_afford(len(chunks), batch.pending_count):
+                    self._queue_chunks(plan, chunks, batch)
+                    return None
+                # No time for another round; keep the leading partial summaries
+                self.metrics.incr('budget.reduce_skipped')
+                plan['complete'] = False
+            
+            summary = ' '.join(summaries[:self.max_summary_parts])
+            if plan['complete']:
+                self._cache_summary(plan['text'], summary)
+            return summary
+            
+        except Exception as e:
+            logger.error(f"Error creating detailed summary: {e}")
+            self.metrics.incr('fallback.simple_summary')
+            return self._simple_summary(plan['text'])
+    
+    def _cache_model_key(self):
+        """Model and generation settings for summary cache keys
+        
+        Converted backends summarise slightly differently, so the key uses the
+        backend the registry actually loaded (a fallback to pytorch isn't cached
+        under the quantized/ONNX key). The decoding preset and length policy
+        change the output too.
+        """
+        model = self.model_name
+        backend = self.registry.effective_backend(model, self.inference_backend)
+        if backend != 'pytorch':
+            model = f"{model}@{backend}"
+        return f"{model}|{self.generation.cache_tag}"
+    
+    def _cache_summary(self, text, summary):
+        """Remember a model-generated summary so unchanged articles skip inference next run"""
+        if self.cache:
+            self.cache.put_summary(text, self._cache_model_key(), summary)
     
     def _simple_summary(self, text):
         """Fallback summary method using simple text processing"""
@@ -248,28 +684,8 @@ class NewsProcessor:
             return "• Key points unavailable"
         
         try:
-            # Simple key point extraction based on sentences
-            sentences = [s.strip() for s in text.split('.') if len(s.strip()) > 20]
-            
-            # Score sentences based on AI-related keywords
-            ai_keywords = ['artificial intelligence', 'ai', 'machine learning', 'deep learning', 
-                          'neural network', 'automation', 'algorithm', 'chatbot', 'llm', 
-                          'generative ai', 'openai', 'anthropic', 'google', 'microsoft']
-            
-            scored_sentences = []
-            for sentence in sentences[:20]:  # Limit to first 20 sentences
-                score = 0
-                sentence_lower = sentence.lower()
-                for keyword in ai_keywords:
-                    if keyword in sentence_lower:
-                        score += 1
-                
-                if score > 0:
-                    scored_sentences.append((sentence, score))
-            
-            # Sort by score and take top 3-4
-            scored_sentences.sort(key=lambda x: x[1], reverse=True)
-            key_points = [sentence[0] for sentence in scored_sentences[:4]]
+            # Sentences scored on AI-related keywords in one pass over the text
+            key_points = self.key_point_extractor.extract(text)
             
             if key_points:
                 return '\n'.join(f"• {point}" for point in key_points)
@@ -294,16 +710,11 @@ class NewsProcessor:
             return 'Unknown'
         
         try:
-            # Parse common date formats
-            for fmt in ['%a, %d %b %Y %H:%M:%S %Z', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d']:
-                try:
-                    dt = datetime.strptime(date_str, fmt)
-                    return dt.strftime('%B %d, %Y')
-                except ValueError:
-                    continue
+            # Feed dates repeat across articles and runs, so parsing is memoised
+            dt = parse_date(date_str)
             
             # If parsing fails, return original
-            return date_str
+            return dt.strftime('%B %d, %Y') if dt else date_str
             
         except Exception:
             return date_str
\ No newline at end of file
@@ -0,0 +1,138 @@
+# ranking.py
+from datetime import datetime, timezone
+from html import unescape
+import logging
+import re
+import zlib
+
+import numpy as np
+
+from key_points import DEFAULT_KEYWORDS
+
+logger = logging.getLogger(__name__)
+
+_TAG = re.compile(r'<[^>]+>')
+_WORD = re.compile(r'\w+')
+
+# How much of an entry's relevance it keeps regardless of age and source, and the
+# shares that depend on recency and source weight
+DEFAULT_MIX = {'relevance': 0.6, 'recency': 0.25, 'source': 0.15}
+
+def _features(text):
+    """Unigram and bigram features, so multi-word keywords can match"""
+    words = _WORD.findall(text.lower())
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+class RelevanceRanker:
+    """Cheap pre-ranking of feed entries on their RSS title and summary
+
+    Entries become hashed TF-IDF vectors (IDF over the candidate batch) and are
+    scored by cosine similarity to the weighted topic keywords, scaled by recency
+    (exponential decay) and a per-source weight. Off-topic entries score zero
+    however fresh they are. Nothing is downloaded, so many more entries can be
+    considered than get summarised.
+    """
+
+    def __init__(self, keywords=DEFAULT_KEYWORDS, source_weights=None, half_life_hours=24,
+                 mix=DEFAULT_MIX, n_features=2 ** 18, title_weight=2.0):
+        if not isinstance(keywords, dict):
+            keywords = {keyword: 1.0 for keyword in keywords or []}
+        # Source weights are keyed by feed URL or by feed title; unlisted sources weigh 1
+        self.source_weights = source_weights or {}
+        self.half_life_hours = half_life_hours
+        self.mix = mix
+        self.n_features = n_features
+        self.title_weight = title_weight
+
+        self.query = np.zeros(n_features)
+        for keyword, weight in keywords.items():
+            feature = ' '.join(_WORD.findall(keyword.lower()))
+            if feature:
+                self.query[self._hash(feature)] += weight
+
+    def rank(self, articles, now=None):
+        """Articles sorted best first; ties keep feed order"""
+        if not articles:
+            return []
+        scores = self.scores(articles, now)
+        order = np.argsort(-scores, kind='stable')
+        return [articles[i] for i in order]
+
+    def partition(self, articles, now=None):
+        """(relevant articles best first, articles with no keyword relevance at all)"""
+        if not articles:
+            return [], []
+        scores = self.scores(articles, now)
+        order = np.argsort(-scores, kind='stable')
+        return ([articles[i] for i in order if scores[i] > 0],
+                [articles[i] for i in order if scores[i] <= 0])
+
+    def scores(self, articles, now=None):
+        """Blended score per article, in [0, 1]"""
+        relevance = self.relevance(articles)
+        peak = relevance.max()
+        # Without any keyword signal (e.g. a topic with no keywords) rank on recency and source alone
+        relevance = relevance / peak if peak > 0 else np.ones(len(articles))
+
+        return relevance * (self.mix['relevance']
+                            + self.mix['recency'] * self.recency(articles, now)
+                            + self.mix['source'] * self.source(articles))
+
+    def relevance(self, articles):
+        """Cosine similarity between each entry's TF-IDF vector and the keyword vector"""
+        rows, cols, values = [], [], []
+        for row, article in enumerate(articles):
+            summary = unescape(_TAG.sub(' ', article.get('summary') or ''))
+            for text, weight in ((article.get('title') or '', self.title_weight), (summary, 1.0)):
+                for feature in _features(text):
+                    rows.append(row)
+                    cols.append(self._hash(feature))
+                    values.append(weight)
+
+        n = len(articles)
+        if not rows:
+            return np.zeros(n)
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+        values = np.array(values)
+
+        # Sum repeated features per entry, then weight by inverse document frequency
+        keys, inverse = np.unique(rows * self.n_features + cols, return_inverse=True)
+        tf = np.bincount(inverse, weights=values)
+        doc_rows, doc_cols = keys // self.n_features, keys % self.n_features
+        document_frequency = np.bincount(doc_cols, minlength=self.n_features)
+        tfidf = tf * (np.log((1 + n) / (1 + document_frequency[doc_cols])) + 1.0)
+
+        norms = np.sqrt(np.bincount(doc_rows, weights=tfidf ** 2, minlength=n))
+        dots = np.bincount(doc_rows, weights=tfidf * self.query[doc_cols], minlength=n)
+        query_norm = np.linalg.norm(self.query)
+        if not query_norm:
+            return np.zeros(n)
+        return dots / (np.where(norms > 0, norms, 1.0) * query_norm)
+
+    def recency(self, articles, now=None):
+        """1 for brand new entries, halving every half_life_hours; 0.5 when the date is unknown"""
+        now = now or datetime.now(timezone.utc)
+        ages = np.full(len(articles), np.nan)
+        for i, article in enumerate(articles):
+            published = article.get('published_at')
+            if published is not None:
+                # Naive feed dates are taken to be UTC
+                if published.tzinfo is None:
+                    published = published.replace(tzinfo=timezone.utc)
+                ages[i] = max(0.0, (now - published).total_seconds() / 3600)
+
+        return np.where(np.isnan(ages), 0.5, 0.5 ** (np.nan_to_num(ages) / self.half_life_hours))
+
+    def source(self, articles):
+        """Configured source weight, scaled so the heaviest source scores 1"""
+        weights = np.array([
+            self.source_weights.get(article.get('feed_url'), self.source_weights.get(article.get('source'), 1.0))
+            for article in articles
+        ], dtype=float)
+        peak = weights.max() if len(weights) else 0
+        return weights / peak if peak > 0 else weights
+
+    def _hash(self, feature):
+        """Stable feature index (Python's hash() changes between runs)"""
+        return zlib.crc32(feature.encode('utf-8')) % self.n_features
@@ -0,0 +1,73 @@
+# run_budget.py
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Summary quality tiers, best first
+FULL = 'full'                # every chunk summarised, reduced again if needed
+SINGLE_PASS = 'single_pass'  # one model pass over the start of the article
+SIMPLE = 'simple'            # extractive _simple_summary, no model
+
+class RunBudget:
+    """Wall-clock budget for a whole run and the summary quality that still fits in it
+
+    reserve_seconds is held back for rendering and sending the email. Model cost
+    is estimated per chunk, starting from seconds_per_chunk and replaced by the
+    observed average once some chunks have run.
+    """
+
+    def __init__(self, total_seconds, reserve_seconds=60, seconds_per_chunk=5.0, metrics=None,
+                 started_at=None):
+        self.total_seconds = total_seconds
+        self.reserve_seconds = reserve_seconds
+        self.default_seconds_per_chunk = seconds_per_chunk
+        self.metrics = metrics
+        # time.monotonic() the budget counts from; pass the process start so
+        # imports and setup are charged to the run too
+        self._start = time.monotonic() if started_at is None else started_at
+
+    @property
+    def deadline(self):
+        """Monotonic time by which model work has to stop"""
+        return self._start + self.total_seconds - self.reserve_seconds
+
+    def elapsed(self):
+        return time.monotonic() - self._start
+
+    def remaining(self):
+        """Seconds left for work before the reserve"""
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def seconds_per_chunk(self):
+        """Observed model seconds per chunk, or the starting estimate"""
+        if self.metrics:
+            chunks = self.metrics.counters.get('chunks_summarised', 0)
+            if chunks:
+                return self.metrics.stages.get('inference', 0.0) / chunks
+        return self.default_seconds_per_chunk
+
+    def can_afford(self, chunks, queued_chunks=0):
+        """True if this many more chunks fit alongside the work already queued"""
+        return (chunks + queued_chunks) * self.seconds_per_chunk() <= self.remaining()
+
+    def choose_tier(self, full_chunks, queued_chunks=0, reserved_chunks=0):
+        """Best tier for an article whose full summary needs full_chunks model passes
+
+        reserved_chunks is model time set aside for higher-priority articles that
+        haven't been planned yet, so they still get at least a single pass.
+        """
+        committed = queued_chunks + reserved_chunks
+        if self.can_afford(full_chunks, committed):
+            tier = FULL
+        elif self.can_afford(1, committed):
+            tier = SINGLE_PASS
+        else:
+            tier = SIMPLE
+
+        if tier != FULL:
+            logger.info(f"Time budget: {self.remaining():.0f}s left, using {tier} summary")
+        return tier
@@ -0,0 +1,69 @@
+# subscriptions.py
+import json
+import logging
+
+from key_points import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+class Topic:
+    """A digest topic: a set of feeds, optionally narrowed by keywords"""
+
+    def __init__(self, name, feeds, keywords=None, max_articles=5, heading=None, intro=None):
+        self.name = name
+        self.feeds = list(feeds)
+        self.max_articles = max_articles
+        self.heading = heading or f"📰 {name} News Digest"
+        self.intro = intro or f"Today's top {name} developments with detailed analysis:"
+        # Without keywords every entry from the topic's feeds qualifies
+        self.keywords = keywords
+        self.matcher = KeywordMatcher(keywords) if keywords else None
+
+    def matches(self, article):
+        """True if the article mentions one of the topic's keywords in its title or RSS summary"""
+        if self.matcher is None:
+            return True
+        text = f"{article.get('title', '')} {article.get('summary', '')}"
+        return next(self.matcher.finditer(text), None) is not None
+
+class Subscriptions:
+    """Topics and the recipients subscribed to each
+
+    The JSON config looks like:
+
+        {"topics": {"AI": {"feeds": [...], "keywords": [...], "max_articles": 5}},
+         "recipients": {"team@example.com": ["AI"]}}
+    """
+
+    def __init__(self, topics, recipients):
+        self.topics = {topic.name: topic for topic in topics}
+        self.recipients = {email: list(names) for email, names in recipients.items()}
+
+        for email, names in self.recipients.items():
+            unknown = [name for name in names if name not in self.topics]
+            if unknown:
+                raise ValueError(f"{email} is subscribed to unknown topics: {', '.join(unknown)}")
+
+    @classmethod
+    def load(cls, path):
+        """Read a subscription config file"""
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+
+        topics = [Topic(name, **options) for name, options in config.get('topics', {}).items()]
+        return cls(topics, config.get('recipients', {}))
+
+    @property
+    def feeds(self):
+        """Every feed any topic needs, each once, in config order"""
+        return list(dict.fromkeys(feed for topic in self.topics.values() for feed in topic.feeds))
+
+    @property
+    def active_topics(self):
+        """Topics with at least one recipient"""
+        subscribed = {name for names in self.recipients.values() for name in names}
+        return [topic for name, topic in self.topics.items() if name in subscribed]
+
+    def recipients_for(self, topic_name):
+        """Addresses subscribed to a topic"""
+        return [email for email, names in self.recipients.items() if topic_name in names]
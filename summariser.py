@@ -1,8 +1,11 @@
-from transformers import pipeline
-
-summariser = pipeline("summarization", model="t5-small", tokenizer="t5-small")
+from model_registry import get_registry
 
 def summarise_headlines(headlines):
+    # t5-small is loaded on first call and shared through the model registry
+    summariser = get_registry().load("t5-small", "T5 Small")
+    if summariser is None:
+        return list(headlines)
+
     combined = ". ".join(headlines)
     input_text = "summarize: " + combined
     summary = summariser(input_text, max_length=60, min_length=20, do_sample=False)
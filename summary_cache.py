@@ -0,0 +1,143 @@
+# summary_cache.py
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class SummaryCache:
+    def __init__(self, path, ttl_seconds=7 * 24 * 3600, max_bytes=200 * 1024 * 1024):
+        # Entries expire after ttl_seconds; least recently used ones go once max_bytes is exceeded
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Extraction runs on worker threads, so share one connection behind a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+        self._conn.commit()
+
+        self.prune()
+
+    def get_article(self, url):
+        """Return cached extracted content for a URL, or None"""
+        content = self._get(f"article:{url}")
+        if content and content.get('publish_date'):
+            content['publish_date'] = datetime.fromisoformat(content['publish_date'])
+        return content
+
+    def put_article(self, url, content):
+        """Store extracted content for a URL"""
+        value = dict(content)
+        if isinstance(value.get('publish_date'), datetime):
+            value['publish_date'] = value['publish_date'].isoformat()
+        self._put(f"article:{url}", value)
+
+    def get_summary(self, text, model_name):
+        """Return a cached summary of this exact text by this model, or None"""
+        entry = self._get(self._summary_key(text, model_name))
+        return entry['summary'] if entry else None
+
+    def put_summary(self, text, model_name, summary):
+        """Store a model summary keyed by the text hash and model name"""
+        self._put(self._summary_key(text, model_name), {'summary': summary})
+
+    def prune(self):
+        """Drop expired entries and evict least recently used ones over the size limit"""
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM entries WHERE created_at < ?",
+                                   (time.time() - self.ttl_seconds,))
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Cache prune failed: {e}")
+
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
+
+    def _summary_key(self, text, model_name):
+        """Content-addressed key for a summary"""
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return f"summary:{model_name}:{digest}"
+
+    def _get(self, key):
+        """Look up a key, honouring the TTL and refreshing its LRU position"""
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                value, created_at = row
+                now = time.time()
+                if created_at < now - self.ttl_seconds:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._conn.commit()
+                    return None
+
+                self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                return json.loads(value)
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning(f"Cache read failed for {key}: {e}")
+                return None
+
+    def _put(self, key, value):
+        """Insert or replace an entry and keep the cache within its size limit"""
+        data = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, data, len(data), now, now)
+                )
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Cache write failed for {key}: {e}")
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Evict down to 90% so we don't pay for an eviction on every insert
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        logger.info(f"Evicted {len(doomed)} cache entries")
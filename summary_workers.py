@@ -0,0 +1,74 @@
+# summary_workers.py
+import logging
+import multiprocessing
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Set in the parent before the pool forks; children inherit the loaded model
+# copy-on-write instead of loading their own copy of the weights
+_worker_summarizer = None
+
+def _init_worker(torch_threads):
+    """Pin each worker's intra-op thread count so workers don't oversubscribe cores"""
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+
+def _summarise_slice(job):
+    """Worker: summarise one slice of a batch with the inherited pipeline"""
+    texts, generate_kwargs = job
+    outputs = _worker_summarizer(texts, batch_size=len(texts), **generate_kwargs)
+    # Return plain dicts; pipeline outputs for list input may be nested per item
+    return [output[0] if isinstance(output, list) else output for output in outputs]
+
+def fork_available():
+    """Sharing weights relies on fork, which isn't available everywhere"""
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+class ProcessPoolSummarizer:
+    """Drop-in replacement for a summarisation pipeline that spreads each batch over forked workers
+
+    The pool is forked once, right after the model is loaded and before the parent
+    runs any inference, so every worker shares the parent's weights. Create it
+    before starting any threads: a fork can copy a lock another thread holds and
+    deadlock the child. Each call splits its chunks into one contiguous slice per worker.
+    """
+
+    def __init__(self, summarizer, workers=2, torch_threads=None):
+        global _worker_summarizer
+        _worker_summarizer = summarizer
+
+        self.summarizer = summarizer
+        self.tokenizer = getattr(summarizer, 'tokenizer', None)
+        self.workers = workers
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // workers)
+
+        if threading.active_count() > 1:
+            logger.warning(f"Forking summarisation workers with {threading.active_count()} threads running; "
+                           f"workers may deadlock on a lock held at fork time")
+
+        context = multiprocessing.get_context('fork')
+        self._pool = context.Pool(workers, initializer=_init_worker, initargs=(self.torch_threads,))
+        logger.info(f"Started {workers} summarisation workers x {self.torch_threads} torch threads")
+
+    def __call__(self, texts, batch_size=None, **generate_kwargs):
+        single = isinstance(texts, str)
+        items = [texts] if single else list(texts)
+
+        # Contiguous slices keep the batch's length sorting intact within each worker
+        slice_size = -(-len(items) // self.workers)
+        jobs = [(items[i:i + slice_size], generate_kwargs) for i in range(0, len(items), slice_size)]
+
+        outputs = []
+        for part in self._pool.map(_summarise_slice, jobs, chunksize=1):
+            outputs.extend(part)
+        return outputs
+
+    def close(self):
+        """Shut the worker pool down"""
+        self._pool.close()
+        self._pool.join()
@@ -0,0 +1,75 @@
+# text_chunker.py
+import logging
+import re
+
+import nltk
+
+logger = logging.getLogger(__name__)
+
+# Models like pegasus report a huge model_max_length; nothing we load takes more than this
+MAX_MODEL_TOKENS = 1024
+
+# Room for special tokens and task prefixes (e.g. T5's "summarize: ")
+SPECIAL_TOKEN_MARGIN = 16
+
+def split_sentences(text):
+    """Split text into sentences, using punkt when it's installed"""
+    try:
+        return [s for s in nltk.sent_tokenize(text) if s.strip()]
+    except LookupError:
+        # punkt data not downloaded; a punctuation split is close enough for packing
+        return [s for s in re.split(r'(?<=[.!?])\s+', text) if s.strip()]
+
+def max_input_tokens(tokenizer):
+    """Largest number of content tokens the model accepts in one input"""
+    limit = getattr(tokenizer, 'model_max_length', None) or MAX_MODEL_TOKENS
+    return min(limit, MAX_MODEL_TOKENS) - SPECIAL_TOKEN_MARGIN
+
+def token_counts(texts, tokenizer):
+    """Token count per text, estimated from word counts without a tokenizer"""
+    if not texts:
+        return []
+    if tokenizer is not None:
+        try:
+            return [len(ids) for ids in tokenizer(texts, add_special_tokens=False)['input_ids']]
+        except Exception as e:
+            logger.debug(f"Tokenizer failed, estimating token counts: {e}")
+    return [int(len(text.split()) * 1.3) + 1 for text in texts]
+
+def chunk_sentences(text, tokenizer, max_tokens=None):
+    """Pack whole sentences into chunks of at most max_tokens model tokens"""
+    if max_tokens is None:
+        max_tokens = max_input_tokens(tokenizer)
+
+    sentences = split_sentences(text)
+    counts = token_counts(sentences, tokenizer)
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for sentence, count in zip(sentences, counts):
+        # A single sentence longer than the window gets split on words
+        if count > max_tokens:
+            if current:
+                chunks.append(' '.join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split_long_sentence(sentence, count, max_tokens))
+            continue
+
+        if current and current_tokens + count > max_tokens:
+            chunks.append(' '.join(current))
+            current, current_tokens = [], 0
+
+        current.append(sentence)
+        current_tokens += count
+
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+def _split_long_sentence(sentence, count, max_tokens):
+    """Cut an over-long sentence into word windows that fit the model"""
+    words = sentence.split()
+    pieces = -(-count // max_tokens)
+    words_per_piece = -(-len(words) // pieces)
+    return [' '.join(words[i:i + words_per_piece]) for i in range(0, len(words), words_per_piece)]